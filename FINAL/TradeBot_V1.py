@@ -1,4 +1,5 @@
 import streamlit as st
+import html
 import yfinance as yf
 import pandas as pd
 from io import BytesIO
@@ -508,6 +509,27 @@ st.markdown(f"""
         animation: pulse 2s infinite;
     }}
 
+    /* Lightweight banners rendered via toast() instead of st.info/st.warning/st.success */
+    .alert {{
+        border-radius: 8px;
+        padding: 0.75rem 1rem;
+        margin: 0.5rem 0;
+        border: 1px solid;
+        color: var(--text-light);
+    }}
+    .alert-info {{
+        border-color: var(--info-color);
+        background-color: rgba(33, 150, 243, 0.1);
+    }}
+    .alert-warn {{
+        border-color: var(--warning-color);
+        background-color: rgba(255, 214, 0, 0.1);
+    }}
+    .alert-ok {{
+        border-color: var(--success-color);
+        background-color: rgba(0, 200, 83, 0.1);
+    }}
+
     /* General text enhancements */
     h1, h2, h3, h4, h5, h6 {{
         color: var(--text-light);
@@ -601,6 +623,10 @@ st.markdown(f"""
 </style>
 """, unsafe_allow_html=True)
 
+def toast(kind, msg):
+    """Render a static info/warn/ok banner styled by the .alert-* classes."""
+    st.markdown(f'<div class="alert alert-{kind}">{html.escape(msg)}</div>', unsafe_allow_html=True)
+
 # --- Header ---
 st.markdown("""
 <div class="header glow-box">
@@ -689,7 +715,7 @@ if 'macd_signal_period' not in st.session_state:
 
 # Initialize watchlist in session state, if not already present
 if 'watchlist' not in st.session_state:
-    st.session_state.watchlist = ["NVDA", "AAPL", "MSFT"] # Default watchlist items
+    st.session_state.watchlist = dict.fromkeys(["NVDA", "AAPL", "MSFT"]) # Default watchlist items (ordered dict used as a set)
 
 current_main_ticker = st.session_state.manual_ticker_input_value_key
 last_price_recorded_time = get_last_price_time(current_main_ticker)
@@ -976,9 +1002,14 @@ with st.container():
         st.markdown(f'<div class="metric-box"><h4>VWAP Diff</h4><h3 class="{vwap_class}">{vwap_diff:.2f}%</h3></div>', unsafe_allow_html=True)
 
 # --- Company Profile / Key Fundamentals ---
+# Cached so reruns (tab switches, widget changes) don't repeat the quoteSummary request
+@st.cache_data(ttl=3600)
+def get_company_profile_info(ticker):
+    return yf.Ticker(ticker).info
+
 st.markdown('<div class="section"><h3>Company Overview</h3></div>', unsafe_allow_html=True)
 try:
-    stock_info = yf.Ticker(ticker).info
+    stock_info = get_company_profile_info(ticker)
     company_name = stock_info.get('longName', 'N/A')
     sector = stock_info.get('sector', 'N/A')
     industry = stock_info.get('industry', 'N/A')
@@ -1006,18 +1037,35 @@ st.markdown('<div class="section"><h2>⚡ Top Market Insights at a Glance</h2></
 OVERVIEW_STOCKS = list(set(TOP_STOCKS + ["SMCI", "GOOG", "AMZN", "MSFT", "TSM", "ASML", "CRM", "ADBE", "INTU", "ORCL", "COST"]))
 OVERVIEW_STOCKS = OVERVIEW_STOCKS[:15]
 
+@st.cache_data(ttl=60)
+def get_overview_ohlcv(tickers):
+    """Daily bars for every overview ticker from one batched download; returns {ticker: DataFrame}."""
+    try:
+        data = yf.download(" ".join(tickers), period="5d", interval="1d", group_by='ticker', auto_adjust=True, progress=False, threads=True)
+    except Exception:
+        return {}
+    if not isinstance(data, pd.DataFrame) or data.empty or not isinstance(data.columns, pd.MultiIndex):
+        return {}
+
+    # Batched frames share one date index, so drop the all-NaN rows a ticker has no bar for
+    available = set(data.columns.get_level_values(0))
+    return {tkr: data[tkr].dropna(how='all') for tkr in tickers if tkr in available}
+
 @st.cache_data(ttl=5 * 60)
 def get_overview_data(tickers, api_key, _sentiment_analyzer):
     overview_results = []
     progress_bar = st.progress(0, text="Analyzing top stocks for quick insights...")
 
+    # All tickers' daily bars come from one batched request
+    ohlcv_by_ticker = get_overview_ohlcv(tickers)
+
     for i, tkr in enumerate(tickers):
         score_checks = 0
         criteria_details = {}
 
         try:
-            df_ohlcv = yf.download(tkr, period="5d", interval="1d", progress=False, auto_adjust=True)
-            if df_ohlcv.empty or len(df_ohlcv) < 2:
+            df_ohlcv = ohlcv_by_ticker.get(tkr)
+            if df_ohlcv is None or df_ohlcv.empty or len(df_ohlcv) < 2:
                 raise ValueError("Insufficient OHLCV data.")
 
             current_price = df_ohlcv['Close'].iloc[-1]
@@ -1178,7 +1226,8 @@ else:
 
 # --- Main Tabs (Re-ordered and added Watchlist) ---
 # Current Tabs: "📊 Live Charts", "📰 Market Pulse", "🔄 Options Flow", "💰 Dividend Analysis", "📚 Learning Center", "⭐ My Watchlist"
-tab1, tab2, tab3, tab4, tab5, tab6 = st.tabs(["📊 Live Charts", "📰 Market Pulse", "🔄 Options Flow", "💰 Dividend Analysis", "📚 Learning Center", "⭐ My Watchlist"])
+# Selection is tracked (a tab switch reruns the script) so tabN.open can skip tabs that are not showing
+tab1, tab2, tab3, tab4, tab5, tab6 = st.tabs(["📊 Live Charts", "📰 Market Pulse", "🔄 Options Flow", "💰 Dividend Analysis", "📚 Learning Center", "⭐ My Watchlist"], key="main_tabs", on_change="rerun")
 
 # --- Tab 1: Live Charts ---
 with tab1:
@@ -1545,17 +1594,14 @@ with tab2:
 
 # --- Tab 3: Options Flow ---
 # Function to calculate Profit/Loss for a single option leg at expiration (MOVED TO GLOBAL SCOPE)
+# Whole price grid in one array expression, same payoff as functions/options_logic.calculate_option_pnl
 def calculate_option_pnl(option_type, strike_price, premium, underlying_prices):
-    pnl = []
+    prices = np.asarray(underlying_prices, dtype=np.float64)
     if option_type == 'call':
-        for price in underlying_prices:
-            profit_loss = max(0, price - strike_price) - premium
-            pnl.append(profit_loss)
+        return np.maximum(0.0, prices - strike_price) - premium
     elif option_type == 'put':
-        for price in underlying_prices:
-            profit_loss = max(0, strike_price - price) - premium
-            pnl.append(profit_loss)
-    return pnl
+        return np.maximum(0.0, strike_price - prices) - premium
+    return np.empty(0)
 
 # Function to calculate Probability of Profit (POP) (NEW)
 def calculate_pop(option_type, strike_price, premium, current_price, implied_volatility, dte):
@@ -1683,6 +1729,12 @@ with tab3:
             st.error(f"Options scan failed: {str(e)}")
             return None
     
+    # Cached so reruns (tab switches, widget changes) reuse the chain; cache_data hands back fresh copies
+    @st.cache_data(ttl=300)
+    def get_option_chain(ticker, exp_date_str):
+        chain = yf.Ticker(ticker).option_chain(exp_date_str)
+        return chain.calls, chain.puts
+    
     options_data = get_options_data(ticker)
     
     if not options_data or not options_data['expirations']:
@@ -1739,9 +1791,7 @@ with tab3:
         dte_timedelta = expiration_date - current_utc_date
         dte = dte_timedelta.days # Get days as integer
 
-        stock = yf.Ticker(ticker)
-        chain = stock.option_chain(exp_date_str)
-        calls, puts = chain.calls.copy(), chain.puts.copy()
+        calls, puts = get_option_chain(ticker, exp_date_str)
 
         col1, col2 = st.columns(2)
         with col1:
@@ -2361,9 +2411,13 @@ with tab5: # This is now the 5th tab
 # --- Watchlist Tab (New tab6) ---
 # Initialize watchlist in session state
 if 'watchlist' not in st.session_state:
-    st.session_state.watchlist = ["NVDA", "AAPL", "MSFT"] # Default watchlist items
+    st.session_state.watchlist = dict.fromkeys(["NVDA", "AAPL", "MSFT"]) # Default watchlist items (ordered dict used as a set)
 
-with tab6: # This is now the 6th tab
+# Rendered as a fragment so add/remove clicks rerun only this tab instead of the
+# whole script (which would re-fetch charts, overview and options data). Full-app
+# reruns skip it entirely unless the watchlist tab is selected (see tab6.open below).
+@st.fragment
+def render_watchlist_tab():
     st.markdown('<div class="section"><h2>⭐ My Watchlist</h2></div>', unsafe_allow_html=True)
     st.markdown("""
         <p style='color:var(--text-subtle); font-size:0.9rem;'>
@@ -2378,26 +2432,27 @@ with tab6: # This is now the 6th tab
     with col_remove:
         st.markdown("<div style='height: 28px;'></div>", unsafe_allow_html=True) # Spacer
         if st.button("Add Stock", key="add_stock_button"):
-            if new_ticker_to_add and new_ticker_to_add not in st.session_state.watchlist:
-                st.session_state.watchlist.append(new_ticker_to_add)
-                st.success(f"Added {new_ticker_to_add} to watchlist!")
-            elif new_ticker_to_add in st.session_state.watchlist:
-                st.warning(f"{new_ticker_to_add} is already in your watchlist.")
+            watchlist = st.session_state.watchlist
+            if not new_ticker_to_add:
+                toast("info", "Please enter a ticker symbol to add.")
+            elif new_ticker_to_add in watchlist:
+                toast("warn", f"{new_ticker_to_add} is already in your watchlist.")
             else:
-                st.info("Please enter a ticker symbol to add.")
+                watchlist[new_ticker_to_add] = None
+                toast("ok", f"Added {new_ticker_to_add} to watchlist!")
     
     # Remove ticker functionality
     if st.session_state.watchlist:
-        tickers_to_remove = st.multiselect("Remove Ticker(s) from Watchlist", options=st.session_state.watchlist, key="remove_ticker_multiselect")
+        tickers_to_remove = st.multiselect("Remove Ticker(s) from Watchlist", options=list(st.session_state.watchlist), key="remove_ticker_multiselect")
         if st.button("Remove Selected", key="remove_selected_button"):
             if tickers_to_remove:
                 for tkr_to_remove in tickers_to_remove:
-                    st.session_state.watchlist.remove(tkr_to_remove)
-                st.success(f"Removed {', '.join(tickers_to_remove)} from watchlist.")
+                    st.session_state.watchlist.pop(tkr_to_remove, None)
+                toast("ok", f"Removed {', '.join(tickers_to_remove)} from watchlist.")
             else:
-                st.info("Please select tickers to remove.")
+                toast("info", "Please select tickers to remove.")
     else:
-        st.info("Your watchlist is currently empty. Add some stocks!", icon="💡")
+        toast("info", "💡 Your watchlist is currently empty. Add some stocks!")
 
     st.markdown("---")
     st.markdown('<h3>Watchlist Insights</h3>', unsafe_allow_html=True)
@@ -2406,7 +2461,7 @@ with tab6: # This is now the 6th tab
         # Re-using get_overview_data for watchlist insights
         # Pass global_sentiment_analyzer directly for caching, as it's a fixed resource.
         # This function doesn't rely on OpenAI explicitly, only NLTK sentiment.
-        watchlist_overview_df = get_overview_data(st.session_state.watchlist, API_KEY, global_sentiment_analyzer)
+        watchlist_overview_df = get_overview_data(list(st.session_state.watchlist), API_KEY, global_sentiment_analyzer)
         
         if not watchlist_overview_df.empty:
             watchlist_overview_df = watchlist_overview_df.sort_values(by="Overall Score", ascending=False).reset_index(drop=True)
@@ -2417,4 +2472,9 @@ with tab6: # This is now the 6th tab
         else:
             st.warning("Could not retrieve live data ", icon="📊")
     else:
-        st.info("Add stocks to your watchlist to see their insights here!", icon="💡")
\ No newline at end of file
+        toast("info", "💡 Add stocks to your watchlist to see their insights here!")
+
+# Only build the watchlist (and its get_overview_data fetch) while its tab is the one showing
+if tab6.open:
+    with tab6: # This is now the 6th tab
+        render_watchlist_tab()
\ No newline at end of file
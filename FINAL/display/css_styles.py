@@ -1,3 +1,6 @@
+import functools
+import string
+
 import streamlit as st
 
 # Claude-inspired color palette
@@ -16,129 +19,128 @@ TEXT_PRIMARY = "#1F1F1F"    # Almost black
 TEXT_SECONDARY = "#6B6B6B"  # Gray
 TEXT_MUTED = "#999999"      # Light gray
 
-def inject_css():
-    st.markdown(f"""
+RAW_CSS = """
     <style>
         @import url('https://fonts.googleapis.com/css2?family=Inter:wght@300;400;500;600;700&display=swap');
         
         /* Global Reset */
-        * {{
+        * {
             font-family: 'Inter', -apple-system, BlinkMacSystemFont, sans-serif;
-        }}
+        }
         
         /* Main App Background */
-        .stApp {{
-            background-color: {BG_PRIMARY};
-        }}
+        .stApp {
+            background-color: $BG_PRIMARY;
+        }
         
         /* Main Container */
-        .main .block-container {{
+        .main .block-container {
             padding: 2rem 3rem;
             max-width: 1400px;
             margin: 0 auto;
-        }}
+        }
         
         /* Headers */
-        h1, h2, h3, h4, h5, h6 {{
-            color: {TEXT_PRIMARY};
+        h1, h2, h3, h4, h5, h6 {
+            color: $TEXT_PRIMARY;
             font-weight: 600;
-        }}
+        }
         
-        h1 {{
+        h1 {
             font-size: 2.5rem;
             margin-bottom: 0.5rem;
-        }}
+        }
         
-        h2 {{
+        h2 {
             font-size: 1.75rem;
             margin-bottom: 1rem;
-        }}
+        }
         
         /* Paragraphs */
-        p {{
-            color: {TEXT_SECONDARY};
+        p {
+            color: $TEXT_SECONDARY;
             line-height: 1.6;
-        }}
+        }
         
         /* Tabs - Claude Style */
-        .stTabs [data-baseweb="tab-list"] {{
+        .stTabs [data-baseweb="tab-list"] {
             gap: 0;
             background-color: transparent;
-            border-bottom: 1px solid {BORDER_COLOR};
+            border-bottom: 1px solid $BORDER_COLOR;
             padding: 0;
             margin-bottom: 2rem;
-        }}
+        }
         
-        .stTabs [data-baseweb="tab"] {{
+        .stTabs [data-baseweb="tab"] {
             background: transparent;
             border: none;
             border-radius: 0;
             padding: 0.75rem 1.5rem !important;
-            color: {TEXT_MUTED} !important;
+            color: $TEXT_MUTED !important;
             font-weight: 500;
             border-bottom: 2px solid transparent;
             transition: all 0.2s ease;
-        }}
+        }
         
-        .stTabs [data-baseweb="tab"]:hover {{
-            color: {TEXT_SECONDARY} !important;
+        .stTabs [data-baseweb="tab"]:hover {
+            color: $TEXT_SECONDARY !important;
             background: transparent !important;
-        }}
+        }
         
-        .stTabs [aria-selected="true"] {{
+        .stTabs [aria-selected="true"] {
             background: transparent !important;
-            color: {PRIMARY_COLOR} !important;
-            border-bottom: 2px solid {PRIMARY_COLOR} !important;
+            color: $PRIMARY_COLOR !important;
+            border-bottom: 2px solid $PRIMARY_COLOR !important;
             font-weight: 600;
-        }}
+        }
         
         /* Cards */
-        .card {{
+        .card {
             background: white;
-            border: 1px solid {BORDER_COLOR};
+            border: 1px solid $BORDER_COLOR;
             border-radius: 12px;
             padding: 1.5rem;
             margin-bottom: 1.5rem;
             transition: box-shadow 0.2s ease;
-        }}
+        }
         
-        .card:hover {{
+        .card:hover {
             box-shadow: 0 4px 12px rgba(0, 0, 0, 0.08);
-        }}
+        }
         
         /* Metric Cards */
-        .metric-card {{
+        .metric-card {
             background: white;
-            border: 1px solid {BORDER_COLOR};
+            border: 1px solid $BORDER_COLOR;
             border-radius: 12px;
             padding: 1.5rem;
             transition: all 0.2s ease;
-        }}
+        }
         
-        .metric-card:hover {{
-            border-color: {PRIMARY_COLOR};
+        .metric-card:hover {
+            border-color: $PRIMARY_COLOR;
             box-shadow: 0 2px 8px rgba(203, 155, 107, 0.15);
-        }}
+        }
         
-        .metric-label {{
+        .metric-label {
             font-size: 0.875rem;
-            color: {TEXT_MUTED};
+            color: $TEXT_MUTED;
             font-weight: 500;
             margin-bottom: 0.5rem;
             text-transform: uppercase;
             letter-spacing: 0.05em;
-        }}
+        }
         
-        .metric-value {{
+        .metric-value {
             font-size: 2rem;
             font-weight: 700;
-            color: {TEXT_PRIMARY};
+            color: $TEXT_PRIMARY;
             line-height: 1;
-        }}
+        }
         
         /* Buttons */
-        .stButton > button {{
-            background: {PRIMARY_COLOR};
+        .stButton > button {
+            background: $PRIMARY_COLOR;
             color: white;
             border: none;
             border-radius: 8px;
@@ -146,157 +148,273 @@ def inject_css():
             font-weight: 500;
             transition: all 0.2s ease;
             box-shadow: 0 1px 3px rgba(0, 0, 0, 0.1);
-        }}
+        }
         
-        .stButton > button:hover {{
-            background: {ACCENT_COLOR};
+        .stButton > button:hover {
+            background: $ACCENT_COLOR;
             box-shadow: 0 4px 12px rgba(203, 155, 107, 0.3);
             transform: translateY(-1px);
-        }}
+        }
         
         /* Selectbox & Inputs */
         .stSelectbox div[data-baseweb="select"] > div,
-        .stTextInput input {{
+        .stTextInput input {
             background-color: white !important;
-            border: 1px solid {BORDER_COLOR} !important;
+            border: 1px solid $BORDER_COLOR !important;
             border-radius: 8px;
-            color: {TEXT_PRIMARY} !important;
+            color: $TEXT_PRIMARY !important;
             font-size: 0.95rem;
-        }}
+        }
         
         .stSelectbox div[data-baseweb="select"] > div:focus-visible,
-        .stTextInput input:focus {{
-            border-color: {PRIMARY_COLOR} !important;
+        .stTextInput input:focus {
+            border-color: $PRIMARY_COLOR !important;
             box-shadow: 0 0 0 3px rgba(203, 155, 107, 0.1) !important;
-        }}
+        }
         
         /* Dropdown Options */
-        div[data-baseweb="popover"] {{
+        div[data-baseweb="popover"] {
             background: white !important;
-            border: 1px solid {BORDER_COLOR} !important;
+            border: 1px solid $BORDER_COLOR !important;
             border-radius: 8px;
             box-shadow: 0 8px 24px rgba(0, 0, 0, 0.12) !important;
-        }}
+        }
         
-        div[data-baseweb="popover"] [role="option"] {{
-            color: {TEXT_PRIMARY} !important;
+        div[data-baseweb="popover"] [role="option"] {
+            color: $TEXT_PRIMARY !important;
             padding: 0.75rem 1rem !important;
-        }}
+        }
         
-        div[data-baseweb="popover"] [role="option"]:hover {{
-            background-color: {BG_SECONDARY} !important;
-        }}
+        div[data-baseweb="popover"] [role="option"]:hover {
+            background-color: $BG_SECONDARY !important;
+        }
         
-        div[data-baseweb="popover"] [aria-selected="true"] {{
+        div[data-baseweb="popover"] [aria-selected="true"] {
             background-color: rgba(203, 155, 107, 0.1) !important;
-            color: {PRIMARY_COLOR} !important;
+            color: $PRIMARY_COLOR !important;
             font-weight: 500 !important;
-        }}
+        }
         
         /* Sidebar */
-        .stSidebar {{
+        .stSidebar {
             background-color: white;
-            border-right: 1px solid {BORDER_COLOR};
-        }}
+            border-right: 1px solid $BORDER_COLOR;
+        }
         
-        .stSidebar .stSelectbox div[data-baseweb="select"] > div {{
-            background-color: {BG_SECONDARY} !important;
-        }}
+        .stSidebar .stSelectbox div[data-baseweb="select"] > div {
+            background-color: $BG_SECONDARY !important;
+        }
         
         /* DataFrames */
-        .stDataFrame {{
-            border: 1px solid {BORDER_COLOR};
+        .stDataFrame {
+            border: 1px solid $BORDER_COLOR;
             border-radius: 12px;
             overflow: hidden;
-        }}
+        }
         
-        .stDataFrame thead th {{
-            background-color: {BG_SECONDARY} !important;
-            color: {TEXT_PRIMARY} !important;
+        .stDataFrame thead th {
+            background-color: $BG_SECONDARY !important;
+            color: $TEXT_PRIMARY !important;
             font-weight: 600 !important;
-            border-bottom: 1px solid {BORDER_COLOR} !important;
+            border-bottom: 1px solid $BORDER_COLOR !important;
             padding: 0.875rem !important;
-        }}
+        }
         
-        .stDataFrame tbody td {{
-            color: {TEXT_PRIMARY} !important;
-            border-bottom: 1px solid {BORDER_COLOR} !important;
+        .stDataFrame tbody td {
+            color: $TEXT_PRIMARY !important;
+            border-bottom: 1px solid $BORDER_COLOR !important;
             padding: 0.75rem !important;
-        }}
+        }
         
-        .stDataFrame tbody tr:hover {{
-            background-color: {BG_SECONDARY} !important;
-        }}
+        .stDataFrame tbody tr:hover {
+            background-color: $BG_SECONDARY !important;
+        }
         
         /* Alert Boxes */
-        .stAlert {{
+        .stAlert {
             border-radius: 8px;
-            border: 1px solid {BORDER_COLOR};
+            border: 1px solid $BORDER_COLOR;
             padding: 1rem;
-        }}
+        }
+        
+        .alert {
+            border-radius: 8px;
+            border: 1px solid $BORDER_COLOR;
+            padding: 0.75rem 1rem;
+            margin: 0.5rem 0;
+            color: $TEXT_PRIMARY;
+        }
+        
+        .alert-info {
+            border-color: $INFO_COLOR;
+            background-color: rgba(99, 102, 241, 0.08);
+        }
+        
+        .alert-warn {
+            border-color: $WARNING_COLOR;
+            background-color: rgba(245, 158, 11, 0.08);
+        }
+        
+        .alert-ok {
+            border-color: $SUCCESS_COLOR;
+            background-color: rgba(16, 185, 129, 0.08);
+        }
         
         /* Info boxes */
-        .element-container .stMarkdown {{
-            color: {TEXT_SECONDARY};
-        }}
+        .element-container .stMarkdown {
+            color: $TEXT_SECONDARY;
+        }
         
         /* Progress Bars */
-        .stProgress > div > div {{
-            background-color: {PRIMARY_COLOR};
-        }}
+        .stProgress > div > div {
+            background-color: $PRIMARY_COLOR;
+        }
         
         /* Expander */
-        .streamlit-expanderHeader {{
+        .streamlit-expanderHeader {
             background-color: white;
-            border: 1px solid {BORDER_COLOR};
+            border: 1px solid $BORDER_COLOR;
             border-radius: 8px;
-            color: {TEXT_PRIMARY};
-        }}
+            color: $TEXT_PRIMARY;
+        }
         
         /* Success/Error/Warning colors */
-        .positive {{
-            color: {SUCCESS_COLOR};
-        }}
+        .positive {
+            color: $SUCCESS_COLOR;
+        }
+        
+        .negative {
+            color: $DANGER_COLOR;
+        }
+        
+        .neutral {
+            color: $TEXT_MUTED;
+        }
+        
+        /* Market Status Panel */
+        .market-status {
+            display: flex;
+            justify-content: space-between;
+            align-items: center;
+            padding: 0.75rem 1.5rem;
+            background-color: $BG_SECONDARY;
+            border-radius: 10px;
+            border: 1px solid $BORDER_COLOR;
+            margin-bottom: 1.5rem;
+        }
         
-        .negative {{
-            color: {DANGER_COLOR};
-        }}
+        .market-status .status-main {
+            display: flex;
+            align-items: center;
+            gap: 0.75rem;
+        }
+        
+        .market-status .status-icon {
+            font-size: 1.25rem;
+        }
+        
+        .market-status .status-msg {
+            font-weight: 600;
+            font-size: 1.1rem;
+            color: $TEXT_PRIMARY;
+        }
+        
+        .market-status .status-time {
+            text-align: right;
+            font-size: 0.9rem;
+        }
+        
+        .market-status .status-time small {
+            display: block;
+            color: $TEXT_SECONDARY;
+            font-size: 0.9rem;
+        }
+        
+        .market-status .status-time span {
+            color: $TEXT_PRIMARY;
+            font-weight: 500;
+        }
         
-        .neutral {{
-            color: {TEXT_MUTED};
-        }}
+        /* Current Metrics */
+        .metrics-section {
+            padding: 1.5rem;
+        }
+        
+        .metrics-grid {
+            display: grid;
+            grid-template-columns: repeat(auto-fit, minmax(200px, 1fr));
+            gap: 1.5rem;
+        }
+        
+        .metric-row {
+            display: flex;
+            align-items: baseline;
+            justify-content: space-between;
+        }
+        
+        .metric-row .metric-delta {
+            font-size: 1.2rem;
+            font-weight: 600;
+        }
         
         /* Hide Streamlit elements */
-        #MainMenu {{visibility: hidden;}}
-        footer {{visibility: hidden;}}
+        #MainMenu {visibility: hidden;}
+        footer {visibility: hidden;}
         
         /* Scrollbar */
-        ::-webkit-scrollbar {{
+        ::-webkit-scrollbar {
             width: 8px;
             height: 8px;
-        }}
+        }
         
-        ::-webkit-scrollbar-track {{
-            background: {BG_SECONDARY};
-        }}
+        ::-webkit-scrollbar-track {
+            background: $BG_SECONDARY;
+        }
         
-        ::-webkit-scrollbar-thumb {{
-            background: {PRIMARY_COLOR};
+        ::-webkit-scrollbar-thumb {
+            background: $PRIMARY_COLOR;
             border-radius: 4px;
-        }}
+        }
         
-        ::-webkit-scrollbar-thumb:hover {{
-            background: {ACCENT_COLOR};
-        }}
+        ::-webkit-scrollbar-thumb:hover {
+            background: $ACCENT_COLOR;
+        }
         
         /* Responsive */
-        @media (max-width: 768px) {{
-            .main .block-container {{
+        @media (max-width: 768px) {
+            .main .block-container {
                 padding: 1rem;
-            }}
-        }}
+            }
+        }
     </style>
-    """, unsafe_allow_html=True)
+    """
+
+# Parsed once at import; substitution results are memoized per theme below.
+_CSS_TMPL = string.Template(RAW_CSS)
+
+_THEMES = {
+    "light": dict(
+        ACCENT_COLOR=ACCENT_COLOR,
+        BG_PRIMARY=BG_PRIMARY,
+        BG_SECONDARY=BG_SECONDARY,
+        BORDER_COLOR=BORDER_COLOR,
+        DANGER_COLOR=DANGER_COLOR,
+        INFO_COLOR=INFO_COLOR,
+        PRIMARY_COLOR=PRIMARY_COLOR,
+        SUCCESS_COLOR=SUCCESS_COLOR,
+        TEXT_MUTED=TEXT_MUTED,
+        TEXT_PRIMARY=TEXT_PRIMARY,
+        TEXT_SECONDARY=TEXT_SECONDARY,
+        WARNING_COLOR=WARNING_COLOR,
+    ),
+}
+
+@functools.lru_cache(maxsize=4)
+def render_css(theme="light"):
+    return _CSS_TMPL.substitute(_THEMES[theme])
+
+def inject_css(theme="light"):
+    st.markdown(render_css(theme), unsafe_allow_html=True)
 
 # Export colors for use in components
 PRIMARY_ACCENT_COLOR_HEX = PRIMARY_COLOR
@@ -1,7 +1,10 @@
+import functools
 import streamlit as st
 import pandas as pd
 import numpy as np
 import yfinance as yf
+import string
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 
 # Import functions from custom modules
@@ -32,28 +35,21 @@ def display_header():
     </div>
     """, unsafe_allow_html=True)
 
-def display_market_status_panel(market_status_msg, market_status_icon, market_status_color, current_ticker, last_price_time):
-    st.markdown(f"""
-    <div style="
-        display: flex; 
-        justify-content: space-between; 
-        align-items: center; 
-        padding: 0.75rem 1.5rem; 
-        background-color: {BG_DARKER_COLOR_HEX}; 
-        border-radius: 10px; 
-        border: 1px solid {BORDER_COLOR_CSS}; 
-        margin-bottom: 1.5rem;
-    ">
-        <div style="display: flex; align-items: center; gap: 0.75rem;">
-            <span style="font-size: 1.25rem;">{market_status_icon}</span>
-            <span style="font-weight: 600; font-size: 1.1rem; color: {TEXT_LIGHT_COLOR_HEX};">{market_status_msg}</span>
-        </div>
-        <div style="text-align: right;">
-            <span style="color: {TEXT_SUBTLE_COLOR_HEX}; font-size: 0.9rem; display: block;">Last Price for {current_ticker}:</span>
-            <span style="color: {TEXT_LIGHT_COLOR_HEX}; font-size: 0.9rem; font-weight: 500;">{last_price_time}</span>
-        </div>
+# Markup templates parsed once at import and filled with .substitute() per rerun
+_STATUS_PANEL_TPL = string.Template("""
+    <div class="market-status">
+        <div class="status-main"><span class="status-icon">$icon</span><span class="status-msg">$msg</span></div>
+        <div class="status-time"><small>Last Price for $ticker:</small><span>$last_price_time</span></div>
     </div>
-    """, unsafe_allow_html=True)
+    """)
+
+def display_market_status_panel(market_status_msg, market_status_icon, market_status_color, current_ticker, last_price_time):
+    st.markdown(_STATUS_PANEL_TPL.substitute(
+        icon=market_status_icon,
+        msg=market_status_msg,
+        ticker=current_ticker,
+        last_price_time=last_price_time
+    ), unsafe_allow_html=True)
 
 # --- Dashboard Metrics & Overview ---
 
@@ -61,69 +57,77 @@ def get_current_metrics(df):
     if df is None or df.empty:
         return 0, 0, 0, 0
     
-    current_price = df['Close'].iloc[-1]
+    close_arr = df['Close'].to_numpy(copy=False)
+    current_price = float(close_arr[-1])
     
-    if len(df['Close']) > 1:
-        prev_close = df['Close'].iloc[-2]
+    if close_arr.size > 1:
+        prev_close = float(close_arr[-2])
         price_change = current_price - prev_close
         percent_change = (price_change / prev_close) * 100
     else:
-        open_price = df['Open'].iloc[-1]
+        open_price = float(df['Open'].to_numpy(copy=False)[-1])
         price_change = current_price - open_price
         percent_change = (price_change / open_price) * 100
 
-    vwap = df['VWAP'].iloc[-1] if 'VWAP' in df.columns else 0
+    vwap = float(df['VWAP'].to_numpy(copy=False)[-1]) if 'VWAP' in df.columns else 0
     vwap_diff = ((current_price - vwap) / vwap) * 100 if vwap != 0 else 0
     
     return current_price, price_change, percent_change, vwap_diff
 
-def display_current_metrics(current_price, price_change, percent_change, volume, vwap_diff):
-    
-    price_color = SUCCESS_COLOR_HEX if price_change >= 0 else DANGER_COLOR_HEX
-    change_symbol = "▲" if price_change >= 0 else "▼"
-    
-    vwap_color = SUCCESS_COLOR_HEX if vwap_diff >= 0 else DANGER_COLOR_HEX
-    vwap_text = "Above VWAP" if vwap_diff >= 0 else "Below VWAP"
-
-    st.markdown(f"""
-    <div class="section" style="padding: 1.5rem;">
-    <div style="
-        display: grid; 
-        grid-template-columns: repeat(auto-fit, minmax(200px, 1fr)); 
-        gap: 1.5rem;
-    ">
+_METRICS_TPL = string.Template("""
+    <div class="section metrics-section">
+    <div class="metrics-grid">
         <div class="metric-box">
             <h4>Current Price</h4>
-            <div style="display: flex; align-items: baseline; justify-content: space-between;">
-                <h3 style="color: var(--text-light);">${current_price:,.2f}</h3>
-                <span class="positive" style="font-size: 1.2rem; font-weight: 600; color: {price_color};">
-                    {change_symbol} {percent_change:+.2f}%
-                </span>
+            <div class="metric-row">
+                <h3>$$$price</h3>
+                <span class="metric-delta $price_class">$change_symbol $percent_change%</span>
             </div>
         </div>
         
         <div class="metric-box">
             <h4>Day's Change</h4>
-            <h3 style="color: {price_color};">{price_change:+.2f}</h3>
+            <h3 class="$price_class">$price_change</h3>
         </div>
         
         <div class="metric-box">
             <h4>Volume</h4>
-            <h3>{volume:,.0f}</h3>
+            <h3>$volume</h3>
         </div>
         
         <div class="metric-box">
             <h4>VWAP Status</h4>
-            <div style="display: flex; align-items: baseline; justify-content: space-between;">
-                <h3 style="color: {vwap_color};">{vwap_text}</h3>
-                <span class="positive" style="font-size: 1.2rem; font-weight: 600; color: {vwap_color};">
-                    {vwap_diff:+.2f}%
-                </span>
+            <div class="metric-row">
+                <h3 class="$vwap_class">$vwap_text</h3>
+                <span class="metric-delta $vwap_class">$vwap_diff%</span>
             </div>
         </div>
     </div>
     </div>
-    """, unsafe_allow_html=True)
+    """)
+
+def display_current_metrics(current_price, price_change, percent_change, volume, vwap_diff):
+    
+    price_class = "positive" if price_change >= 0 else "negative"
+    change_symbol = "▲" if price_change >= 0 else "▼"
+    
+    vwap_class = "positive" if vwap_diff >= 0 else "negative"
+    vwap_text = "Above VWAP" if vwap_diff >= 0 else "Below VWAP"
+
+    st.markdown(_METRICS_TPL.substitute(
+        price=f"{current_price:,.2f}",
+        price_class=price_class,
+        change_symbol=change_symbol,
+        percent_change=f"{percent_change:+.2f}",
+        price_change=f"{price_change:+.2f}",
+        volume=f"{volume:,.0f}",
+        vwap_class=vwap_class,
+        vwap_text=vwap_text,
+        vwap_diff=f"{vwap_diff:+.2f}"
+    ), unsafe_allow_html=True)
+
+_COMPANY_INFO_KEYS = ('longName', 'sector', 'industry', 'marketCap', 'trailingPE', 'forwardPE', 'fiftyTwoWeekHigh', 'fiftyTwoWeekLow', 'longBusinessSummary')
+_NA_INFO = {key: "N/A" for key in _COMPANY_INFO_KEYS}
 
 @st.cache_data(ttl=3600)
 def get_company_info(ticker):
@@ -131,9 +135,7 @@ def get_company_info(ticker):
         stock = yf.Ticker(ticker)
         info = stock.info
         
-        required_keys = ['longName', 'sector', 'industry', 'marketCap', 'trailingPE', 'forwardPE', 'fiftyTwoWeekHigh', 'fiftyTwoWeekLow', 'longBusinessSummary']
-        
-        cleaned_info = {key: info.get(key, "N/A") for key in required_keys}
+        cleaned_info = {key: info.get(key, "N/A") for key in _COMPANY_INFO_KEYS}
         
         cleaned_info['marketCap'] = info.get('marketCap', 0)
         cleaned_info['trailingPE'] = info.get('trailingPE', 0)
@@ -141,11 +143,30 @@ def get_company_info(ticker):
         cleaned_info['fiftyTwoWeekHigh'] = info.get('fiftyTwoWeekHigh', 0)
         cleaned_info['fiftyTwoWeekLow'] = info.get('fiftyTwoWeekLow', 0)
 
+        # fast_info costs extra requests, so only consult it for quote numbers .info came back without
+        fast_info_keys = {'marketCap': 'marketCap', 'fiftyTwoWeekHigh': 'yearHigh', 'fiftyTwoWeekLow': 'yearLow'}
+        missing = [key for key in fast_info_keys if not cleaned_info[key]]
+        if missing:
+            try:
+                fast = stock.fast_info
+                for key in missing:
+                    cleaned_info[key] = fast.get(fast_info_keys[key]) or 0
+            except Exception:
+                pass  # Keep the .info values; the overview shows N/A for zeros
+
         return cleaned_info
     except Exception:
-        return {key: "N/A" for key in required_keys}
+        return _NA_INFO.copy()
 
 
+@functools.lru_cache(maxsize=1024)
+def format_large_number(num):
+    if num == 0 or num == 'N/A': return "N/A"
+    if num > 1e12: return f"${num/1e12:.2f} T"
+    if num > 1e9: return f"${num/1e9:.2f} B"
+    if num > 1e6: return f"${num/1e6:.2f} M"
+    return f"${num:,.2f}"
+
 def display_company_overview(ticker):
     info = get_company_info(ticker)
     
@@ -168,13 +189,6 @@ def display_company_overview(ticker):
 
     with col2:
         st.markdown("#### Key Fundamentals")
-        
-        def format_large_number(num):
-            if num == 0 or num == 'N/A': return "N/A"
-            if num > 1e12: return f"${num/1e12:.2f} T"
-            if num > 1e9: return f"${num/1e9:.2f} B"
-            if num > 1e6: return f"${num/1e6:.2f} M"
-            return f"${num:,.2f}"
 
         st.markdown(f"""
         <div style="
@@ -206,24 +220,43 @@ def display_company_overview(ticker):
     st.markdown('</div>', unsafe_allow_html=True)
 
 
+def _download_metrics_chunk(chunk):
+    try:
+        return chunk, yf.download(chunk, period="2d", group_by='ticker', threads=True, progress=False, auto_adjust=True)
+    except Exception:
+        return chunk, None
+
 @st.cache_data(ttl=600)
 def get_top_stock_metrics(stock_list):
     metrics = []
-    for ticker in stock_list:
-        try:
-            stock = yf.Ticker(ticker)
-            hist = stock.history(period="2d")
-            if not hist.empty and len(hist) > 1:
-                current_price = hist['Close'].iloc[-1]
-                prev_close = hist['Close'].iloc[-2]
-                change_pct = ((current_price - prev_close) / prev_close) * 100
-                metrics.append({
-                    'symbol': ticker,
-                    'price': f"${current_price:.2f}",
-                    'change_pct': change_pct
-                })
-        except Exception:
-            pass 
+    stock_list = list(stock_list)
+    if not stock_list:
+        return metrics
+    # One multi-ticker request per chunk instead of one request per symbol;
+    # Yahoo accepts roughly 20 symbols per download URL. Chunks are I/O-bound,
+    # so they are fetched concurrently and aggregated here in order.
+    chunks = [stock_list[start:start + 20] for start in range(0, len(stock_list), 20)]
+    with ThreadPoolExecutor(max_workers=min(8, len(chunks))) as executor:
+        results = list(executor.map(_download_metrics_chunk, chunks))
+
+    for chunk, data in results:
+        if data is None or data.empty:
+            continue
+        for ticker in chunk:
+            try:
+                closes = data[ticker]['Close'] if isinstance(data.columns, pd.MultiIndex) else data['Close']
+                closes = closes.dropna()
+                if len(closes) > 1:
+                    current_price = closes.iloc[-1]
+                    prev_close = closes.iloc[-2]
+                    change_pct = ((current_price - prev_close) / prev_close) * 100
+                    metrics.append({
+                        'symbol': ticker,
+                        'price': f"${current_price:.2f}",
+                        'change_pct': change_pct
+                    })
+            except Exception:
+                pass 
     return metrics
 
 def display_top_insights(stock_list, api_key, sentiment_analyzer):
@@ -253,6 +286,50 @@ def display_top_insights(stock_list, api_key, sentiment_analyzer):
 
 # --- Tab 1: Live Charts ---
 
+# Charts longer than CHART_MAX_POINTS are thinned to ~CHART_TARGET_POINTS before
+# plotting; browser paint time and websocket payload scale with point count.
+CHART_MAX_POINTS = 1000
+CHART_TARGET_POINTS = 500
+
+def _lttb_indices(y, n_out):
+    """Row positions kept by Largest-Triangle-Three-Buckets downsampling of y."""
+    n = len(y)
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
+
+    x = np.arange(n, dtype=np.float64)
+    # n_out - 2 buckets between the fixed first and last points
+    edges = np.linspace(1, n - 1, n_out - 1).astype(np.int64)
+    idx = np.empty(n_out, dtype=np.int64)
+    idx[0], idx[-1] = 0, n - 1
+
+    a = 0
+    for i in range(n_out - 2):
+        start, end = edges[i], edges[i + 1]
+        next_end = edges[i + 2] if i + 2 < len(edges) else n
+        avg_x = x[end:next_end].mean()
+        avg_y = y[end:next_end].mean()
+        area = np.abs((x[a] - avg_x) * (y[start:end] - y[a]) - (x[a] - x[start:end]) * (avg_y - y[a]))
+        a = start + int(np.argmax(np.nan_to_num(area, nan=-1.0)))
+        idx[i + 1] = a
+    return idx
+
+def _downsample_series(series, n_out=CHART_TARGET_POINTS):
+    if len(series) <= CHART_MAX_POINTS:
+        return series
+    return series.iloc[_lttb_indices(series.to_numpy(dtype=np.float64), n_out)]
+
+def _downsample_ohlc(df, n_out=CHART_TARGET_POINTS):
+    """Merge consecutive bars into ~n_out wider candles (works for any bar interval)."""
+    if len(df) <= CHART_MAX_POINTS:
+        return df
+    step = -(-len(df) // n_out)
+    bars = df.groupby(np.arange(len(df)) // step).agg(
+        {'Open': 'first', 'High': 'max', 'Low': 'min', 'Close': 'last'}
+    )
+    bars.index = df.index[::step]
+    return bars
+
 def display_chart_analysis(df, rsi, macd, signal, support_levels, resistance_levels, current_price):
     st.markdown("## Price Action & Technicals")
     
@@ -268,26 +345,34 @@ def display_chart_analysis(df, rsi, macd, signal, support_levels, resistance_lev
         row_heights=[0.7, 0.3]
     )
 
+    # Nearest three levels each side, shared by the chart lines and the level list below
+    top_support = list(support_levels[-3:])
+    top_resistance = list(resistance_levels[-3:])
+
+    candles = _downsample_ohlc(df)
+    vwap_line = _downsample_series(df['VWAP'])
+    rsi_line = _downsample_series(rsi)
+
     fig.add_trace(go.Candlestick(
-        x=df.index,
-        open=df['Open'],
-        high=df['High'],
-        low=df['Low'],
-        close=df['Close'],
+        x=candles.index,
+        open=candles['Open'],
+        high=candles['High'],
+        low=candles['Low'],
+        close=candles['Close'],
         name='Candlestick',
         increasing_line_color=SUCCESS_COLOR_HEX,
         decreasing_line_color=DANGER_COLOR_HEX
     ), row=1, col=1)
 
-    fig.add_trace(go.Scatter(
-        x=df.index,
-        y=df['VWAP'],
+    fig.add_trace(go.Scattergl(
+        x=vwap_line.index,
+        y=vwap_line,
         mode='lines',
         name='VWAP',
         line=dict(color=PRIMARY_ACCENT_COLOR_HEX, width=1.5, dash='dash')
     ), row=1, col=1)
 
-    for i, level in enumerate(support_levels[-3:]):
+    for i, level in enumerate(top_support):
         fig.add_hline(
             y=level, line_width=1, line_dash="dash", 
             line_color=SUCCESS_COLOR_HEX, opacity=0.7,
@@ -297,7 +382,7 @@ def display_chart_analysis(df, rsi, macd, signal, support_levels, resistance_lev
             row=1, col=1
         )
 
-    for i, level in enumerate(resistance_levels[-3:]):
+    for i, level in enumerate(top_resistance):
         fig.add_hline(
             y=level, line_width=1, line_dash="dash", 
             line_color=DANGER_COLOR_HEX, opacity=0.7,
@@ -316,9 +401,9 @@ def display_chart_analysis(df, rsi, macd, signal, support_levels, resistance_lev
         row=1, col=1
     )
 
-    fig.add_trace(go.Scatter(
-        x=rsi.index,
-        y=rsi,
+    fig.add_trace(go.Scattergl(
+        x=rsi_line.index,
+        y=rsi_line,
         mode='lines',
         name='RSI',
         line=dict(color=INFO_COLOR_HEX, width=1.5)
@@ -363,9 +448,9 @@ def display_chart_analysis(df, rsi, macd, signal, support_levels, resistance_lev
                 '<div class="sr-level resistance"><span>No significant resistance levels found.</span></div>', 
                 unsafe_allow_html=True
             )
-        for level in resistance_levels[-3:]:
+        if top_resistance:
             st.markdown(
-                f'<div class="sr-level resistance"><strong>${level:,.2f}</strong> <span>Potential Sell Zone</span></div>', 
+                ''.join(f'<div class="sr-level resistance"><strong>${level:,.2f}</strong> <span>Potential Sell Zone</span></div>' for level in top_resistance), 
                 unsafe_allow_html=True
             )
             
@@ -375,9 +460,9 @@ def display_chart_analysis(df, rsi, macd, signal, support_levels, resistance_lev
                 '<div class="sr-level support"><span>No significant support levels found.</span></div>', 
                 unsafe_allow_html=True
             )
-        for level in support_levels[-3:]:
+        if top_support:
             st.markdown(
-                f'<div class="sr-level support"><strong>${level:,.2f}</strong> <span>Potential Buy Zone</span></div>', 
+                ''.join(f'<div class="sr-level support"><strong>${level:,.2f}</strong> <span>Potential Buy Zone</span></div>' for level in top_support), 
                 unsafe_allow_html=True
             )
 
@@ -386,18 +471,21 @@ def display_chart_analysis(df, rsi, macd, signal, support_levels, resistance_lev
         
         fig_macd = go.Figure()
         
-        fig_macd.add_trace(go.Scatter(
-            x=macd.index, y=macd, mode='lines', name='MACD Line',
+        histogram = _downsample_series(macd - signal)
+        macd_line = _downsample_series(macd)
+        signal_line = _downsample_series(signal)
+        
+        fig_macd.add_trace(go.Scattergl(
+            x=macd_line.index, y=macd_line, mode='lines', name='MACD Line',
             line=dict(color=PRIMARY_ACCENT_COLOR_HEX, width=1.5)
         ))
         
-        fig_macd.add_trace(go.Scatter(
-            x=signal.index, y=signal, mode='lines', name='Signal Line',
+        fig_macd.add_trace(go.Scattergl(
+            x=signal_line.index, y=signal_line, mode='lines', name='Signal Line',
             line=dict(color=WARNING_COLOR_HEX, width=1.5, dash='dash')
         ))
         
-        histogram = macd - signal
-        colors = [SUCCESS_COLOR_HEX if val >= 0 else DANGER_COLOR_HEX for val in histogram]
+        colors = np.where(histogram.to_numpy() >= 0, SUCCESS_COLOR_HEX, DANGER_COLOR_HEX)
         fig_macd.add_trace(go.Bar(
             x=histogram.index, y=histogram, name='Histogram', marker_color=colors
         ))
@@ -434,7 +522,7 @@ def display_market_pulse(ticker, api_key, sentiment_analyzer):
     sentiment_df = calculations.analyze_sentiment_for_articles_vader(news_articles, sentiment_analyzer)
     
     if not sentiment_df.empty:
-        avg_score = sentiment_df['sentiment_score'].mean()
+        avg_score = float(sentiment_df['sentiment_score'].to_numpy().mean())
         
         if avg_score >= 0.05:
             sentiment_label, sentiment_color, sentiment_icon = "Positive", SUCCESS_COLOR_HEX, "😄"
@@ -453,6 +541,8 @@ def display_market_pulse(ticker, api_key, sentiment_analyzer):
         </div>
         """, unsafe_allow_html=True)
 
+    # One markdown call for all cards instead of one per article
+    cards_html = []
     for article in news_articles[:10]:
         headline = article.get('headline', 'No Headline')
         summary = article.get('summary', 'No Summary')
@@ -461,137 +551,85 @@ def display_market_pulse(ticker, api_key, sentiment_analyzer):
         
         if len(summary) > 150: summary = summary[:150] + "..."
             
-        st.markdown(f"""
-        <div class="news-card">
-            <h4>{headline}</h4>
-            <small>Source: {source}</small>
-            <p>{summary}</p>
-            <a href="{url}" target="_blank">Read Full Article &rarr;</a>
-        </div>
-        """, unsafe_allow_html=True)
+        # Kept on one line: indented or blank-separated chunks would be read as markdown code blocks
+        cards_html.append(
+            f'<div class="news-card"><h4>{headline}</h4><small>Source: {source}</small>'
+            f'<p>{summary}</p><a href="{url}" target="_blank">Read Full Article &rarr;</a></div>'
+        )
+
+    st.markdown('<div class="news-list">' + ''.join(cards_html) + '</div>', unsafe_allow_html=True)
 
 
 # --- Tab 3: OPTIONS FLOW - COMPLETELY REDESIGNED ---
 
+# Timeframes scored by analyze_trend_properly, all derived from one 15m series:
+# (resample rule or None for raw 15m, label, lookback bars for % change,
+#  SMA window or None, threshold %, weight, up note, down note)
+TREND_TIMEFRAMES = (
+    ('1D', 'Daily', 2, 3, 0.5, 0.40, 'Above 3-day avg', 'Below 3-day avg'),
+    ('1h', 'Hourly', 6, 6, 0.3, 0.30, '6h trend', '6h trend'),
+    ('30min', '30min', 4, None, 0.2, 0.20, '2h momentum', '2h momentum'),
+    (None, '15min', 4, None, 0.15, 0.10, '1h momentum', '1h momentum'),
+)
+
+def _extract_close(df):
+    """Close column of a yfinance frame as a float64 Series, flat or MultiIndex columns."""
+    if df is None or df.empty or 'Close' not in df.columns.get_level_values(0):
+        return pd.Series(dtype=np.float64)
+    close = df['Close']
+    if isinstance(close, pd.DataFrame):
+        close = close.iloc[:, 0]
+    return close.astype(np.float64, copy=False).dropna()
+
+def _timeframe_signal(close_prices, lookback, sma_window, threshold):
+    """Score one timeframe: returns (1 up / -1 down / 0 flat, % change over lookback)."""
+    current = close_prices[-1]
+    prev = close_prices[-lookback]
+    change = ((current - prev) / prev) * 100
+
+    above_sma = below_sma = True
+    if sma_window:
+        sma = sum(close_prices[-sma_window:]) / sma_window
+        above_sma, below_sma = current > sma, current < sma
+
+    if above_sma and change > threshold:
+        return 1, change
+    if below_sma and change < -threshold:
+        return -1, change
+    return 0, change
+
+@st.cache_data(ttl=300)
 def analyze_trend_properly(ticker_symbol):
     """
     Properly analyze trend using multiple timeframes with better logic
     """
     try:
-        # Fetch data for different timeframes
-        data_1d = yf.download(ticker_symbol, period="5d", interval="1d", progress=False, auto_adjust=True)
-        data_1h = yf.download(ticker_symbol, period="5d", interval="1h", progress=False, auto_adjust=True)
-        data_30m = yf.download(ticker_symbol, period="2d", interval="30m", progress=False, auto_adjust=True)
-        data_15m = yf.download(ticker_symbol, period="1d", interval="15m", progress=False, auto_adjust=True)
-        
+        # One 15m download covers every timeframe; coarser bars are resampled locally
+        data_15m = yf.download(ticker_symbol, period="5d", interval="15m", progress=False, auto_adjust=True, threads=False)
+        close_15m = _extract_close(data_15m)
+        if close_15m.empty:
+            return "Neutral", 0, ["⚠️ Insufficient data for analysis"]
+
         signals = []
         weights = []
         details = []
         
-        # 1-Day Analysis (Weight: 40%)
-        if not data_1d.empty and len(data_1d) >= 3:
-            # Extract Close column properly
-            if isinstance(data_1d.columns, pd.MultiIndex):
-                close_col = data_1d['Close'].iloc[:, 0] if isinstance(data_1d['Close'], pd.DataFrame) else data_1d['Close']
+        # Closes are pulled out as plain floats: on 3-6 values, sum()/n beats np.mean dispatch
+        for rule, label, lookback, sma_window, threshold, weight, up_note, down_note in TREND_TIMEFRAMES:
+            closes = close_15m if rule is None else close_15m.resample(rule).last().dropna()
+            close_prices = closes.tolist()
+            if len(close_prices) < max(lookback, sma_window or 0):
+                continue
+
+            signal, change = _timeframe_signal(close_prices, lookback, sma_window, threshold)
+            if signal > 0:
+                details.append(f"📈 {label}: UP {change:+.2f}% ({up_note})")
+            elif signal < 0:
+                details.append(f"📉 {label}: DOWN {change:+.2f}% ({down_note})")
             else:
-                close_col = data_1d['Close']
-            
-            close_prices = close_col.values
-            
-            # Ensure we have scalar values
-            if len(close_prices) >= 3:
-                sma_3 = float(np.mean(close_prices[-3:]))
-                current = float(close_prices[-1])
-                prev = float(close_prices[-2])
-                
-                day_change = ((current - prev) / prev) * 100
-                
-                if current > sma_3 and day_change > 0.5:
-                    signals.append(1)
-                    details.append(f"📈 Daily: UP {day_change:+.2f}% (Above 3-day avg)")
-                elif current < sma_3 and day_change < -0.5:
-                    signals.append(-1)
-                    details.append(f"📉 Daily: DOWN {day_change:+.2f}% (Below 3-day avg)")
-                else:
-                    signals.append(0)
-                    details.append(f"➖ Daily: FLAT {day_change:+.2f}%")
-                weights.append(0.40)
-        
-        # 1-Hour Analysis (Weight: 30%)
-        if not data_1h.empty and len(data_1h) >= 6:
-            if isinstance(data_1h.columns, pd.MultiIndex):
-                close_col = data_1h['Close'].iloc[:, 0] if isinstance(data_1h['Close'], pd.DataFrame) else data_1h['Close']
-            else:
-                close_col = data_1h['Close']
-            
-            close_prices = close_col.values
-            
-            if len(close_prices) >= 6:
-                sma_6 = float(np.mean(close_prices[-6:]))
-                current = float(close_prices[-1])
-                prev_6 = float(close_prices[-6])
-                change_6h = ((current - prev_6) / prev_6) * 100
-                
-                if current > sma_6 and change_6h > 0.3:
-                    signals.append(1)
-                    details.append(f"📈 Hourly: UP {change_6h:+.2f}% (6h trend)")
-                elif current < sma_6 and change_6h < -0.3:
-                    signals.append(-1)
-                    details.append(f"📉 Hourly: DOWN {change_6h:+.2f}% (6h trend)")
-                else:
-                    signals.append(0)
-                    details.append(f"➖ Hourly: FLAT {change_6h:+.2f}%")
-                weights.append(0.30)
-        
-        # 30-Minute Analysis (Weight: 20%)
-        if not data_30m.empty and len(data_30m) >= 4:
-            if isinstance(data_30m.columns, pd.MultiIndex):
-                close_col = data_30m['Close'].iloc[:, 0] if isinstance(data_30m['Close'], pd.DataFrame) else data_30m['Close']
-            else:
-                close_col = data_30m['Close']
-            
-            close_prices = close_col.values
-            
-            if len(close_prices) >= 4:
-                current = float(close_prices[-1])
-                prev_4 = float(close_prices[-4])
-                change_2h = ((current - prev_4) / prev_4) * 100
-                
-                if change_2h > 0.2:
-                    signals.append(1)
-                    details.append(f"📈 30min: UP {change_2h:+.2f}% (2h momentum)")
-                elif change_2h < -0.2:
-                    signals.append(-1)
-                    details.append(f"📉 30min: DOWN {change_2h:+.2f}% (2h momentum)")
-                else:
-                    signals.append(0)
-                    details.append(f"➖ 30min: FLAT {change_2h:+.2f}%")
-                weights.append(0.20)
-        
-        # 15-Minute Analysis (Weight: 10%)
-        if not data_15m.empty and len(data_15m) >= 4:
-            if isinstance(data_15m.columns, pd.MultiIndex):
-                close_col = data_15m['Close'].iloc[:, 0] if isinstance(data_15m['Close'], pd.DataFrame) else data_15m['Close']
-            else:
-                close_col = data_15m['Close']
-            
-            close_prices = close_col.values
-            
-            if len(close_prices) >= 4:
-                current = float(close_prices[-1])
-                prev_4 = float(close_prices[-4])
-                change_1h = ((current - prev_4) / prev_4) * 100
-                
-                if change_1h > 0.15:
-                    signals.append(1)
-                    details.append(f"📈 15min: UP {change_1h:+.2f}% (1h momentum)")
-                elif change_1h < -0.15:
-                    signals.append(-1)
-                    details.append(f"📉 15min: DOWN {change_1h:+.2f}% (1h momentum)")
-                else:
-                    signals.append(0)
-                    details.append(f"➖ 15min: FLAT {change_1h:+.2f}%")
-                weights.append(0.10)
+                details.append(f"➖ {label}: FLAT {change:+.2f}%")
+            signals.append(signal)
+            weights.append(weight)
         
         # Calculate weighted score
         if signals and weights:
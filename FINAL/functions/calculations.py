@@ -1,10 +1,14 @@
+import functools
+import math
 import pandas as pd
 import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
 import streamlit as st
 import nltk
 from nltk.sentiment.vader import SentimentIntensityAnalyzer
 import pytz
 from datetime import datetime, timedelta, timezone
+from scipy.signal import lfilter
 from scipy.stats import norm
 import yfinance as yf
 import requests
@@ -13,10 +17,12 @@ import requests
 SUCCESS_COLOR_HEX = "#10b981"
 TEXT_SUBTLE_COLOR_HEX = "#94a3b8"
 
+# Resolved once at import instead of on every rerun
+_EASTERN = pytz.timezone('US/Eastern')
+
 def get_market_status():
     """Clean market status."""
-    eastern = pytz.timezone('US/Eastern')
-    now = datetime.now(eastern)
+    now = datetime.now(_EASTERN)
 
     market_open = now.replace(hour=9, minute=30, second=0, microsecond=0)
     market_close = now.replace(hour=16, minute=0, second=0, microsecond=0)
@@ -37,52 +43,51 @@ def analyze_market_trend(trend_data):
     if not trend_data:
         return "Neutral", 0, ["Not enough data for trend analysis."]
 
-    trend_score = 0
-    reasons = []
-
     weights = {"5m": 0.4, "15m": 0.3, "30m": 0.2, "1h": 0.1}
     valid_intervals = [i for i in trend_data.keys() if i in weights]
 
+    # Collect the endpoints of every usable interval, then score them in one NumPy pass
+    notes = {}
+    scored, firsts, lasts = [], [], []
     for interval in valid_intervals:
         close_prices = trend_data[interval]
         # Ensure we have at least two data points to compare
         if not isinstance(close_prices, pd.Series) or len(close_prices) < 2:
-            reasons.append(f"⚠️ Insufficient data for {interval}")
+            notes[interval] = f"⚠️ Insufficient data for {interval}"
             continue
 
-        # Explicitly get the first and last numerical price values
-        first_price = close_prices.iloc[0]
-        last_price = close_prices.iloc[-1]
+        values = close_prices.to_numpy()
+        first_price, last_price = values[0], values[-1]
 
         # Check if prices are valid numbers
         if not isinstance(first_price, (int, float, np.number)) or not isinstance(last_price, (int, float, np.number)):
-             reasons.append(f"⚠️ Non-numeric data for {interval}")
-             continue
+            notes[interval] = f"⚠️ Non-numeric data for {interval}"
+            continue
 
-        # Calculate percentage change, handling potential division by zero
-        if first_price == 0:
-            price_change_pct = 0.0
-        else:
-            price_change_pct = (last_price - first_price) / first_price * 100
+        scored.append(interval)
+        firsts.append(first_price)
+        lasts.append(last_price)
 
-        # The comparison causing the error - price_change_pct MUST be a single number here
-        interval_score = 0
-        try:
-            if price_change_pct > 0.1:  # Threshold to ignore minor noise
-                interval_score = 1
-                reasons.append(f"📈 {interval} is UP {price_change_pct:+.2f}%")
-            elif price_change_pct < -0.1:
-                interval_score = -1
-                reasons.append(f"📉 {interval} is DOWN {price_change_pct:+.2f}%")
-            else:
-                reasons.append(f"➖ {interval} is Flat ({price_change_pct:+.2f}%)")
-        except Exception as e:
-            # Catch unexpected comparison errors
-            reasons.append(f"⚠️ Error comparing {interval}: {e}")
-            continue # Skip this interval if comparison fails
+    firsts = np.asarray(firsts, dtype=np.float64)
+    lasts = np.asarray(lasts, dtype=np.float64)
+
+    # Percentage change per interval, 0 where the first price is 0
+    with np.errstate(divide='ignore', invalid='ignore'):
+        price_change_pct = np.where(firsts != 0, (lasts - firsts) / firsts * 100, 0.0)
 
+    # +1 / -1 outside the +/-0.1% noise band, 0 inside it (or for NaN)
+    interval_scores = np.where(price_change_pct > 0.1, 1, np.where(price_change_pct < -0.1, -1, 0))
+    trend_score = float((interval_scores * np.array([weights[i] for i in scored])).sum())
+
+    for interval, change, score in zip(scored, price_change_pct, interval_scores):
+        if score > 0:
+            notes[interval] = f"📈 {interval} is UP {change:+.2f}%"
+        elif score < 0:
+            notes[interval] = f"📉 {interval} is DOWN {change:+.2f}%"
+        else:
+            notes[interval] = f"➖ {interval} is Flat ({change:+.2f}%)"
 
-        trend_score += interval_score * weights[interval]
+    reasons = [notes[interval] for interval in valid_intervals]
 
     # Determine final trend based on the weighted score
     if trend_score > 0.1:
@@ -125,51 +130,106 @@ def load_sentiment_analyzer_global():
             return None
 
 
+@functools.lru_cache(maxsize=4096)
+def _compound_score(analyzer, text):
+    # Wire-copy headlines repeat across tickers; memoize the compound score by exact text.
+    # The analyzer is the single cache_resource instance, so it only adds an identity check to the key.
+    return analyzer.polarity_scores(text)['compound']
+
+
+# Column order and dtypes of the frame returned by analyze_sentiment_for_articles_vader
+_SENT_COLS = ['date', 'sentiment_score', 'sentiment_label', 'headline']
+_SENT_DTYPES = {'sentiment_score': 'float32', 'sentiment_label': 'category', 'headline': 'string'}
+
 def analyze_sentiment_for_articles_vader(articles, analyzer):
     # Check if analyzer was loaded successfully
     if analyzer is None:
         return pd.DataFrame() # Return empty DataFrame if analyzer failed to load
 
-    sentiment_data = []
     if not articles: return pd.DataFrame()
 
+    # Assemble all texts up front, then score them in one pass. Timestamps are validated here
+    # (Finnhub sends epoch seconds) so the scoring loop needs no exception handling.
+    batch = []
     for article in articles:
+        ts = article.get('datetime', 0)
+        if not (isinstance(ts, (int, float, np.number)) and 0 <= ts < 2**37):
+            continue
         text_to_analyze = f"{article.get('headline', '')}. {article.get('summary', '')}"
         if text_to_analyze.strip():
-            try:
-                vs = analyzer.polarity_scores(text_to_analyze)
-                compound_score = vs['compound']
-
-                if compound_score >= 0.05: sentiment_label = "POSITIVE"
-                elif compound_score <= -0.05: sentiment_label = "NEGATIVE"
-                else: sentiment_label = "NEUTRAL"
-
-                sentiment_data.append({
-                    'date': datetime.fromtimestamp(article.get('datetime', 0), tz=timezone.utc).date(),
-                    'sentiment_score': compound_score,
-                    'sentiment_label': sentiment_label,
-                    'headline': article.get('headline', '')
-                })
-            except Exception: pass # Ignore errors for single articles
-    return pd.DataFrame(sentiment_data)
+            batch.append((ts, article.get('headline', ''), text_to_analyze))
+
+    # Column arrays filled in place, one slot per batched article
+    n = len(batch)
+    dates = np.empty(n, dtype=object)
+    scores = np.empty(n, dtype=np.float32)
+    headlines = np.empty(n, dtype=object)
+    for k, (ts, headline, text_to_analyze) in enumerate(batch):
+        dates[k] = datetime.fromtimestamp(ts, tz=timezone.utc).date()
+        scores[k] = _compound_score(analyzer, text_to_analyze)
+        headlines[k] = headline
+
+    labels = np.where(scores >= 0.05, "POSITIVE", np.where(scores <= -0.05, "NEGATIVE", "NEUTRAL"))
+    return pd.DataFrame({
+        'date': dates,
+        'sentiment_score': scores,
+        'sentiment_label': labels,
+        'headline': headlines
+    }, columns=_SENT_COLS).astype(_SENT_DTYPES)
+
+def _ffill_bfill(values):
+    """Forward fill then backward fill NaNs in a 1-D float array, like Series.ffill().bfill()."""
+    valid = ~np.isnan(values)
+    if valid.all() or not valid.any():
+        return values
+    # Index of the most recent valid entry at each position
+    last_valid = np.where(valid, np.arange(values.size), 0)
+    np.maximum.accumulate(last_valid, out=last_valid)
+    filled = values[last_valid]
+    first_valid = np.argmax(valid)
+    filled[:first_valid] = values[first_valid]
+    return filled
 
 def calculate_vwap(df):
-    df = df.copy()
+    # Returns a new frame via assign(); the caller's frame is not copied or modified
     if all(col in df.columns for col in ['High', 'Low', 'Close', 'Volume']):
-        # Ensure Volume column is numeric and handle potential NaNs
-        df['Volume'] = pd.to_numeric(df['Volume'], errors='coerce').fillna(0)
-
-        df['TypicalPrice'] = (df['High'] + df['Low'] + df['Close']) / 3
-        df['price_volume_weighted'] = df['TypicalPrice'] * df['Volume']
-        df['CumVol'] = df['Volume'].cumsum()
-        df['CumVolPrice'] = df['price_volume_weighted'].cumsum()
-        # Add small epsilon to prevent division by zero if CumVol is 0
-        df['VWAP'] = df['CumVolPrice'] / (df['CumVol'].replace(0, np.nan) + 1e-10)
-        df['VWAP'] = df['VWAP'].ffill().bfill() # Forward fill then backward fill NaNs
-        df.drop(columns=['TypicalPrice', 'price_volume_weighted'], inplace=True, errors='ignore')
-    else:
-        df['VWAP'] = np.nan # Assign NaN if required columns are missing
-    return df
+        # Ensure Volume column is numeric and handle potential NaNs (skipped for clean numeric volume, the usual yfinance case)
+        volume = df['Volume']
+        if not pd.api.types.is_numeric_dtype(volume) or volume.hasnans:
+            volume = pd.to_numeric(volume, errors='coerce').fillna(0)
+
+        # Cumulative typical-price * volume over cumulative volume, computed on plain arrays
+        volume_arr = volume.to_numpy(dtype=np.float64)
+        typical_price = (df['High'].to_numpy(dtype=np.float64) + df['Low'].to_numpy(dtype=np.float64) + df['Close'].to_numpy(dtype=np.float64)) / 3
+        cum_vol = np.cumsum(volume_arr)
+        # nancumsum skips rows with a NaN price like pandas cumsum did; those rows stay NaN and are filled below
+        price_volume = typical_price * volume_arr
+        cum_vol_price = np.nancumsum(price_volume)
+        cum_vol_price[np.isnan(price_volume)] = np.nan
+        # Zero cumulative volume yields NaN instead of dividing by zero
+        with np.errstate(divide='ignore', invalid='ignore'):
+            vwap = cum_vol_price / np.where(cum_vol == 0, np.nan, cum_vol)
+        return df.assign(Volume=volume, VWAP=_ffill_bfill(vwap))
+    return df.assign(VWAP=np.nan) # Assign NaN if required columns are missing
+
+
+def _merge_levels(sorted_vals, tolerance_factor, mean_fallback):
+    """Walk sorted price levels, averaging each into the current level while it stays within tolerance."""
+    if not sorted_vals:
+        return []
+
+    merged = []
+    level = sorted_vals[0]
+    for val in sorted_vals[1:]:
+        ref_price = level if level != 0 else mean_fallback
+        threshold = ref_price * tolerance_factor if not math.isnan(ref_price) else 0.01 # Handle potential NaN mean
+        if not math.isnan(threshold) and abs(val - level) > threshold:
+            merged.append(level)
+            level = val
+        else:
+            level = (level + val) / 2
+    merged.append(level)
+    return merged
 
 
 def find_pivots(series, window=5):
@@ -183,45 +243,46 @@ def find_pivots(series, window=5):
     if len(series) < window:
         return [], [] # Cannot calculate pivots if series is too short
 
-    min_val = series.rolling(window=window, center=True, min_periods=1).min() # Use min_periods=1 for edges
-    max_val = series.rolling(window=window, center=True, min_periods=1).max()
+    # Centered rolling min/max over a padded window view; +/-inf padding (and in place of NaN)
+    # reproduces rolling(center=True, min_periods=1) without the pandas rolling machinery
+    arr = series.to_numpy(dtype=np.float64)
+    half = window // 2
+    nan_mask = np.isnan(arr)
+    lows = np.pad(np.where(nan_mask, np.inf, arr), half, constant_values=np.inf)
+    highs = np.pad(np.where(nan_mask, -np.inf, arr), half, constant_values=-np.inf)
+    min_val = sliding_window_view(lows, window).min(axis=1)
+    max_val = sliding_window_view(highs, window).max(axis=1)
 
-    # Drop NaNs that might result from rolling operation edge cases
-    supports_raw = series[series == min_val].dropna()
-    resistances_raw = series[series == max_val].dropna()
+    # NaN never compares equal, so gaps drop out here
+    supports_raw = arr[arr == min_val]
+    resistances_raw = arr[arr == max_val]
 
     tolerance_factor = 0.005
     series_mean_fallback = series.mean() # Pre-calculate mean as fallback
 
-    unique_supports = []
-    if not supports_raw.empty:
-        sorted_supports = sorted(supports_raw.unique())
-        if sorted_supports:
-            unique_supports.append(sorted_supports[0])
-            for val in sorted_supports[1:]:
-                ref_price = unique_supports[-1] if unique_supports[-1] != 0 else series_mean_fallback
-                threshold = ref_price * tolerance_factor if pd.notna(ref_price) else 0.01 # Handle potential NaN mean
-                if pd.notna(threshold) and abs(val - unique_supports[-1]) > threshold:
-                    unique_supports.append(val)
-                elif len(unique_supports) > 0: # Ensure list is not empty before averaging
-                    unique_supports[-1] = (unique_supports[-1] + val) / 2
-
-    unique_resistances = []
-    if not resistances_raw.empty:
-        sorted_resistances = sorted(resistances_raw.unique(), reverse=True)
-        if sorted_resistances:
-            unique_resistances.append(sorted_resistances[0])
-            for val in sorted_resistances[1:]:
-                ref_price = unique_resistances[-1] if unique_resistances[-1] != 0 else series_mean_fallback
-                threshold = ref_price * tolerance_factor if pd.notna(ref_price) else 0.01
-                if pd.notna(threshold) and abs(val - unique_resistances[-1]) > threshold:
-                    unique_resistances.append(val)
-                elif len(unique_resistances) > 0:
-                     unique_resistances[-1] = (unique_resistances[-1] + val) / 2
+    unique_supports = _merge_levels(np.unique(supports_raw).tolist(), tolerance_factor, series_mean_fallback)
+    unique_resistances = _merge_levels(np.unique(resistances_raw)[::-1].tolist(), tolerance_factor, series_mean_fallback)
 
     return sorted(unique_supports), sorted(unique_resistances, reverse=True)
 
 
+def _wilder_average(values, period):
+    """Simple average of the first `period` values, then Wilder smoothing (alpha = 1/period); NaN before the seed."""
+    alpha = 1.0 / period
+    smoothed = np.full(values.shape, np.nan)
+    seed = values[:period].mean()
+    smoothed[period - 1] = seed
+    # y[i] = alpha * x[i] + (1 - alpha) * y[i-1], run as a compiled recursive filter
+    smoothed[period:] = lfilter([alpha], [1.0, alpha - 1.0], values[period:], zi=[(1.0 - alpha) * seed])[0]
+    return smoothed
+
+
+def _ema(values, span):
+    """Exponential moving average matching ewm(span=span, adjust=False): seeded with the first value."""
+    alpha = 2.0 / (span + 1)
+    return lfilter([alpha], [1.0, alpha - 1.0], values, zi=[(1.0 - alpha) * values[0]])[0]
+
+
 def calculate_technical_indicators(df):
     rsi, macd_line, signal_line = pd.Series(dtype=float), pd.Series(dtype=float), pd.Series(dtype=float)
     if 'Close' not in df.columns or df['Close'].empty or df['Close'].isna().all():
@@ -231,40 +292,34 @@ def calculate_technical_indicators(df):
     if close_prices.empty:
          return pd.Series(dtype=float), pd.Series(dtype=float), pd.Series(dtype=float)
 
+    close = close_prices.to_numpy(dtype=np.float64)
+
     # RSI
     RSI_PERIOD = 14
     if len(close_prices) <= RSI_PERIOD: # Need enough data for RSI
         rsi = pd.Series([50] * len(df.index), index=df.index) # Default to 50 if not enough data
     else:
-        delta = close_prices.diff()
-        gain = delta.clip(lower=0).fillna(0) # Fill NaNs created by diff
-        loss = -delta.clip(upper=0).fillna(0)
+        delta = np.diff(close, prepend=close[0]) # First bar has no change
+        gain = np.maximum(delta, 0)
+        loss = np.maximum(-delta, 0)
 
-        # Use simple moving average for the first calculation then switch to exponential
-        avg_gain = gain.rolling(window=RSI_PERIOD, min_periods=RSI_PERIOD).mean()[:RSI_PERIOD]
-        avg_loss = loss.rolling(window=RSI_PERIOD, min_periods=RSI_PERIOD).mean()[:RSI_PERIOD]
+        avg_gain = _wilder_average(gain, RSI_PERIOD)
+        avg_loss = _wilder_average(loss, RSI_PERIOD)
 
-        # Apply EWM for subsequent periods
-        avg_gain = pd.concat([avg_gain, gain[RSI_PERIOD:]]).ewm(alpha=1/RSI_PERIOD, adjust=False).mean()
-        avg_loss = pd.concat([avg_loss, loss[RSI_PERIOD:]]).ewm(alpha=1/RSI_PERIOD, adjust=False).mean()
-
-
-        rs = avg_gain / (avg_loss.replace(0, 1e-10))
+        rs = avg_gain / np.where(avg_loss == 0, 1e-10, avg_loss)
         rsi = 100 - (100 / (1 + rs))
-        rsi = rsi.reindex(df.index).fillna(50) # Reindex to original DataFrame index and fill NaNs
+        rsi = pd.Series(rsi, index=close_prices.index).reindex(df.index).fillna(50) # Reindex to original DataFrame index and fill NaNs
 
     # MACD
     MACD_FAST_PERIOD = 12
     MACD_SLOW_PERIOD = 26
     MACD_SIGNAL_PERIOD = 9
     if len(close_prices) >= MACD_SLOW_PERIOD: # Need enough data for MACD
-        ema_fast = close_prices.ewm(span=MACD_FAST_PERIOD, adjust=False).mean()
-        ema_slow = close_prices.ewm(span=MACD_SLOW_PERIOD, adjust=False).mean()
-        macd_line = (ema_fast - ema_slow).reindex(df.index) # Reindex
-        signal_line = macd_line.ewm(span=MACD_SIGNAL_PERIOD, adjust=False).mean().reindex(df.index) # Reindex
-        # Fill initial NaNs that result from EMA calculations
-        macd_line = macd_line.fillna(0)
-        signal_line = signal_line.fillna(0)
+        macd_values = _ema(close, MACD_FAST_PERIOD) - _ema(close, MACD_SLOW_PERIOD)
+        signal_values = _ema(macd_values, MACD_SIGNAL_PERIOD)
+        # Reindex to the original DataFrame index; bars with no close get 0
+        macd_line = pd.Series(macd_values, index=close_prices.index).reindex(df.index).fillna(0)
+        signal_line = pd.Series(signal_values, index=close_prices.index).reindex(df.index).fillna(0)
     else:
         # If not enough data, return empty series aligned with the main df index
         macd_line = pd.Series([0.0] * len(df.index), index=df.index)
@@ -273,35 +328,37 @@ def calculate_technical_indicators(df):
 
     return rsi, macd_line, signal_line
 
-def calculate_pop(option_type, strike_price, premium, current_price, implied_volatility, dte):
-    if not all(isinstance(x, (int, float, np.number)) for x in [strike_price, premium, current_price, implied_volatility, dte]):
-        return np.nan # Ensure all inputs are numeric
-    if dte <= 0 or implied_volatility <= 0 or current_price <=0 or strike_price <= 0:
-        return np.nan # Basic validity checks
+def calculate_pop_vec(option_type, strike_price, premium, current_price, implied_volatility, dte):
+    """
+    Vectorized calculate_pop: every numeric argument may be an array (option_type a scalar or an
+    array of 'call'/'put'). Returns an array of probabilities, NaN wherever the inputs are invalid.
+    """
+    strike_price = np.asarray(strike_price, dtype=np.float64)
+    current_price = np.asarray(current_price, dtype=np.float64)
+    implied_volatility = np.asarray(implied_volatility, dtype=np.float64)
+    dte = np.asarray(dte, dtype=np.float64)
+    option_type = np.asarray(option_type)
 
     time_to_expiration_years = dte / 365.0
     r = 0.05 # Assume 5% risk-free rate
     q = 0.0 # Assume no dividend yield
 
-    sigma_sqrt_t = implied_volatility * np.sqrt(time_to_expiration_years)
-    if sigma_sqrt_t == 0: return np.nan
+    # Basic validity checks; NaN inputs fail them too
+    valid = (dte > 0) & (implied_volatility > 0) & (current_price > 0) & (strike_price > 0)
 
-    try:
-        # Use log(current_price / strike_price) for d1 calculation
+    with np.errstate(divide='ignore', invalid='ignore'):
+        sigma_sqrt_t = implied_volatility * np.sqrt(time_to_expiration_years)
         d1 = (np.log(current_price / strike_price) + (r - q + 0.5 * implied_volatility**2) * time_to_expiration_years) / sigma_sqrt_t
         d2 = d1 - sigma_sqrt_t
 
-        if option_type == 'call':
-            # Probability of finishing ITM for a call is N(d2)
-            pop = norm.cdf(d2)
-        elif option_type == 'put':
-            # Probability of finishing ITM for a put is N(-d2)
-            pop = norm.cdf(-d2)
-        else:
-            pop = np.nan
+    # Probability of finishing ITM: N(d2) for calls, N(-d2) for puts, in one cdf call
+    direction = np.where(option_type == 'call', 1.0, np.where(option_type == 'put', -1.0, np.nan))
+    pop = np.clip(norm.cdf(direction * d2), 0, 1)
 
-    except (ZeroDivisionError, ValueError, OverflowError):
-        return np.nan
+    return np.where(valid & (sigma_sqrt_t != 0), pop, np.nan)
+
+def calculate_pop(option_type, strike_price, premium, current_price, implied_volatility, dte):
+    if not all(isinstance(x, (int, float, np.number)) for x in [strike_price, premium, current_price, implied_volatility, dte]):
+        return np.nan # Ensure all inputs are numeric
 
-    # Ensure POP is between 0 and 1
-    return np.clip(pop, 0, 1) if pd.notna(pop) else np.nan
\ No newline at end of file
+    return calculate_pop_vec(option_type, strike_price, premium, current_price, implied_volatility, dte)[()]
@@ -4,6 +4,12 @@ import streamlit as st
 import pytz
 from datetime import datetime, timedelta, timezone
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+# Shared keep-alive session so repeat Finnhub calls reuse the TCP/TLS connection
+_SESSION = requests.Session()
+_SESSION.mount('https://', HTTPAdapter(max_retries=Retry(total=3, backoff_factor=0.3, status_forcelist=[502, 503, 504])))
 
 @st.cache_data(ttl=60)
 def get_stock_data(ticker_symbol_to_fetch, interval_to_fetch, period_to_fetch):
@@ -35,24 +41,26 @@ def get_stock_data(ticker_symbol_to_fetch, interval_to_fetch, period_to_fetch):
         return None
 
 
+# Trend intervals and the pandas resample rule that rebuilds each one from 1m bars
+_TREND_RESAMPLE_RULES = {"5m": "5min", "15m": "15min", "30m": "30min", "1h": "1h"}
+
 @st.cache_data(ttl=60)
 def get_market_trend_data(ticker_symbol):
     """Fetches historical data across multiple short-term intervals for trend analysis."""
-    intervals = ["5m", "15m", "30m", "1h"]
-    trend_data = {}
-    period_to_fetch = "5d"
-
-    for interval in intervals:
-        try:
-            data = yf.download(ticker_symbol, interval=interval, period=period_to_fetch, auto_adjust=True, progress=False)
-            if isinstance(data, pd.DataFrame) and not data.empty and 'Close' in data.columns:
-                trend_data[interval] = data['Close']
-            else:
-                trend_data[interval] = pd.Series(dtype=float)
-        except Exception:
-            trend_data[interval] = pd.Series(dtype=float)
+    # One 1m download resampled locally instead of a separate request per interval
+    try:
+        data = yf.download(ticker_symbol, interval="1m", period="5d", auto_adjust=True, progress=False)
+    except Exception:
+        data = None
+
+    if not isinstance(data, pd.DataFrame) or data.empty or 'Close' not in data.columns:
+        return {interval: pd.Series(dtype=float) for interval in _TREND_RESAMPLE_RULES}
+
+    close = data['Close']
+    if isinstance(close, pd.DataFrame):
+        close = close.iloc[:, 0]
 
-    return trend_data
+    return {interval: close.resample(rule).last().dropna() for interval, rule in _TREND_RESAMPLE_RULES.items()}
 
 
 @st.cache_data(ttl=30)
@@ -137,7 +145,7 @@ def get_news_from_finnhub(ticker, api_key):
     params = {"symbol": ticker, "from": from_date, "to": to_date, "token": api_key}
 
     try:
-        news_response = requests.get(news_url, params=params, timeout=10)
+        news_response = _SESSION.get(news_url, params=params, timeout=10)
         news_response.raise_for_status()
         news_data = news_response.json()
         if isinstance(news_data, list):
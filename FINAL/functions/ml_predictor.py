@@ -1,5 +1,9 @@
+import os
+import re
+import joblib
 import pandas as pd
 import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
 from sklearn.linear_model import LogisticRegression
 from sklearn.model_selection import train_test_split
 from sklearn.preprocessing import StandardScaler
@@ -9,6 +13,49 @@ import yfinance as yf
 from functions import calculations, data_fetcher
 
 
+@st.cache_data(ttl=300)
+def _cached_get(ticker, interval, period):
+    """get_stock_data held for 5 minutes so train/predict reruns reuse the same daily bars."""
+    return data_fetcher.get_stock_data(ticker, interval, period)
+
+
+# Fitted StockPricePredictor models on disk, one file per ticker/period/interval, in the user's cache dir
+_MODEL_CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "market_trader", "models")
+
+
+def _model_cache_path(ticker, period, interval):
+    """Artifact path for a ticker/period/interval; anything outside [A-Za-z0-9._-] becomes '_' so the name stays in the cache dir."""
+    stem = re.sub(r"[^A-Za-z0-9._-]", "_", f"{ticker}_{period}_{interval}")
+    return os.path.join(_MODEL_CACHE_DIR, f"{stem}.joblib")
+
+
+def _rolling_mean(values, window):
+    """Trailing mean over `window` values, NaN until the window fills (rolling(window).mean())."""
+    out = np.full(values.shape, np.nan)
+    if len(values) >= window:
+        out[window - 1:] = sliding_window_view(values, window).mean(axis=1)
+    return out
+
+
+def _rolling_std(values, window):
+    """Trailing sample standard deviation, NaN until the window fills (rolling(window).std())."""
+    out = np.full(values.shape, np.nan)
+    if len(values) >= window:
+        out[window - 1:] = sliding_window_view(values, window).std(axis=1, ddof=1)
+    return out
+
+
+def _pct_change(values, periods):
+    """Fractional change against the value `periods` rows earlier, NaN for the first rows."""
+    out = np.empty(values.shape)
+    out[:periods] = np.nan
+    if len(values) > periods:
+        # Shifted divide straight into the output slice, then subtract 1 in place
+        np.divide(values[periods:], values[:-periods], out=out[periods:])
+        out[periods:] -= 1
+    return out
+
+
 class StockPricePredictor:
     """
     Logistic Regression model to predict if stock price will go UP or DOWN.
@@ -17,54 +64,63 @@ class StockPricePredictor:
     
     def __init__(self):
         self.model = LogisticRegression(random_state=42, max_iter=1000)
-        self.scaler = StandardScaler()
+        # copy=False scales the train/test splits in place; predict() never calls transform()
+        self.scaler = StandardScaler(copy=False)
         self.is_trained = False
         self.feature_names = []
+        self._w = self._b = self._mu = self._sd = None
         
     def prepare_features(self, df):
         """
         Extract technical indicators as features for the model.
         Returns feature matrix and target variable (1 = price goes up, 0 = price goes down).
         """
-        df = df.copy()
-        
         # Calculate technical indicators
         rsi, macd_line, signal_line = calculations.calculate_technical_indicators(df)
-        df['RSI'] = rsi
-        df['MACD'] = macd_line
-        df['MACD_Signal'] = signal_line
+        df = df.assign(RSI=rsi, MACD=macd_line, MACD_Signal=signal_line)
         
         # Calculate VWAP
         df = calculations.calculate_vwap(df)
         
-        # Price-based features
-        df['Price_Change'] = df['Close'].pct_change()
-        df['Price_Change_5d'] = df['Close'].pct_change(5)
-        df['Price_Change_10d'] = df['Close'].pct_change(10)
-        
-        # Volume features
-        df['Volume_Change'] = df['Volume'].pct_change()
-        df['Volume_Ratio'] = df['Volume'] / df['Volume'].rolling(20).mean()
+        # Pull each input column out once and derive every feature from the arrays
+        close = df['Close'].to_numpy(dtype=np.float64)
+        volume = df['Volume'].to_numpy(dtype=np.float64)
+        macd = df['MACD'].to_numpy(dtype=np.float64)
+        macd_signal = df['MACD_Signal'].to_numpy(dtype=np.float64)
+        vwap = df['VWAP'].to_numpy(dtype=np.float64)
         
         # Moving averages
-        df['SMA_5'] = df['Close'].rolling(5).mean()
-        df['SMA_20'] = df['Close'].rolling(20).mean()
-        df['SMA_50'] = df['Close'].rolling(50).mean()
-        df['Price_vs_SMA5'] = (df['Close'] - df['SMA_5']) / df['SMA_5']
-        df['Price_vs_SMA20'] = (df['Close'] - df['SMA_20']) / df['SMA_20']
-        df['Price_vs_VWAP'] = (df['Close'] - df['VWAP']) / (df['VWAP'] + 1e-9)
-        
-        # Volatility
-        df['Volatility'] = df['Close'].rolling(20).std()
-        df['High_Low_Range'] = (df['High'] - df['Low']) / df['Close']
-        
-        # MACD features
-        df['MACD_Histogram'] = df['MACD'] - df['MACD_Signal']
-        df['MACD_Cross'] = (df['MACD'] > df['MACD_Signal']).astype(int)
+        sma_5 = _rolling_mean(close, 5)
+        sma_20 = _rolling_mean(close, 20)
         
-        # Target variable: Will price go up in next period? (1 = yes, 0 = no)
-        # We'll predict if price goes up in the next day
-        df['Target'] = (df['Close'].shift(-1) > df['Close']).astype(int)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            features = {
+                # Price-based features
+                'Price_Change': _pct_change(close, 1),
+                'Price_Change_5d': _pct_change(close, 5),
+                'Price_Change_10d': _pct_change(close, 10),
+                
+                # Volume features
+                'Volume_Change': _pct_change(volume, 1),
+                'Volume_Ratio': volume / _rolling_mean(volume, 20),
+                
+                'Price_vs_SMA5': (close - sma_5) / sma_5,
+                'Price_vs_SMA20': (close - sma_20) / sma_20,
+                'Price_vs_VWAP': (close - vwap) / (vwap + 1e-9),
+                
+                # Volatility
+                'Volatility': _rolling_std(close, 20),
+                'High_Low_Range': (df['High'].to_numpy(dtype=np.float64) - df['Low'].to_numpy(dtype=np.float64)) / close,
+                
+                # MACD features
+                'MACD_Histogram': macd - macd_signal,
+                'MACD_Cross': (macd > macd_signal).astype(int),
+                
+                # Target variable: Will price go up in next period? (1 = yes, 0 = no)
+                # We'll predict if price goes up in the next day
+                'Target': np.append(close[1:] > close[:-1], False).astype(int),
+            }
+        df = df.assign(**features)
         
         # Select features
         feature_cols = [
@@ -82,8 +138,9 @@ class StockPricePredictor:
         if len(df) == 0:
             return None, None, []
         
-        X = df[feature_cols].values
-        y = df['Target'].values
+        # float32 halves the bytes the scaler and solver stream through; sklearn keeps float32 input as float32
+        X = df[feature_cols].to_numpy(dtype=np.float32)
+        y = df['Target'].to_numpy(dtype=np.int8)
         
         # Remove last row since target is NaN (no future price)
         X = X[:-1]
@@ -98,18 +155,27 @@ class StockPricePredictor:
         """
         try:
             # Fetch historical data
-            df = data_fetcher.get_stock_data(ticker, interval, period)
+            df = _cached_get(ticker, interval, period)
             if df is None or df.empty:
                 return False, "Failed to fetch data"
             
+            # Reuse a model fitted on exactly these bars (same last bar and close) instead of refitting
+            cache_path = _model_cache_path(ticker, period, interval)
+            last_bar = (str(df.index[-1]), float(df['Close'].iloc[-1]))
+            metrics = self._load_cached_model(cache_path, last_bar)
+            if metrics is not None:
+                return True, metrics
+            
             # Prepare features
             X, y, feature_cols = self.prepare_features(df)
             if X is None or len(X) < 50:
                 return False, f"Insufficient data. Need at least 50 samples, got {len(X) if X is not None else 0}"
             
-            # Split data
+            # Split data; stratify only when up/down days are clearly imbalanced (next-day labels
+            # usually sit near 50/50, where stratifying buys nothing but extra passes over y)
+            stratify = y if abs(y.mean() - 0.5) > 0.15 else None
             X_train, X_test, y_train, y_test = train_test_split(
-                X, y, test_size=0.2, random_state=42, stratify=y
+                X, y, test_size=0.2, random_state=42, stratify=stratify
             )
             
             # Scale features
@@ -119,22 +185,68 @@ class StockPricePredictor:
             # Train model
             self.model.fit(X_train_scaled, y_train)
             
+            self._set_fitted_params()
+            
             # Evaluate
             y_pred = self.model.predict(X_test_scaled)
             accuracy = accuracy_score(y_test, y_pred)
             
             self.is_trained = True
             
-            return True, {
+            metrics = {
                 'accuracy': accuracy,
                 'train_samples': len(X_train),
                 'test_samples': len(X_test),
                 'features': len(feature_cols)
             }
             
+            # Persist for later sessions; a read-only disk only costs the refit next time
+            try:
+                os.makedirs(_MODEL_CACHE_DIR, exist_ok=True)
+                joblib.dump({
+                    'model': self.model,
+                    'scaler': self.scaler,
+                    'feature_names': self.feature_names,
+                    'metrics': metrics,
+                    'last_bar': last_bar
+                }, cache_path)
+            except OSError:
+                pass
+            
+            return True, metrics
+            
         except Exception as e:
             return False, f"Training error: {str(e)}"
     
+    def _set_fitted_params(self):
+        """Keep the fitted parameters as plain arrays for inline single-row inference in predict()."""
+        self._w = self.model.coef_[0]
+        self._b = float(self.model.intercept_[0])
+        self._mu = self.scaler.mean_
+        self._sd = self.scaler.scale_
+    
+    def _load_cached_model(self, cache_path, last_bar):
+        """
+        Load a model saved by train() if it was fitted on data ending at last_bar, a (timestamp, close) pair.
+        A still-forming bar changes its close, so a model fitted mid-session is refit once the bar moves.
+        Returns the saved training metrics, or None when the artifact is missing, stale or unreadable.
+        """
+        if not os.path.exists(cache_path):
+            return None
+        try:
+            artifact = joblib.load(cache_path)
+        except Exception:
+            return None
+        if artifact.get('last_bar') != last_bar:
+            return None
+        
+        self.model = artifact['model']
+        self.scaler = artifact['scaler']
+        self.feature_names = artifact['feature_names']
+        self._set_fitted_params()
+        self.is_trained = True
+        return artifact['metrics']
+    
     def predict(self, ticker):
         """
         Predict if stock price will go UP (1) or DOWN (0) in the next period.
@@ -145,7 +257,7 @@ class StockPricePredictor:
         
         try:
             # Get latest data
-            df = data_fetcher.get_stock_data(ticker, '1d', '3mo')
+            df = _cached_get(ticker, '1d', '3mo')
             if df is None or df.empty:
                 return None, None, None, "Failed to fetch current data"
             
@@ -155,17 +267,15 @@ class StockPricePredictor:
                 return None, None, None, "Insufficient data for prediction"
             
             # Use most recent data point
-            X_latest = X[-1:].reshape(1, -1)
-            X_latest_scaled = self.scaler.transform(X_latest)
-            
-            # Predict
-            prediction = self.model.predict(X_latest_scaled)[0]
-            probabilities = self.model.predict_proba(X_latest_scaled)[0]
+            X_latest = X[-1]
             
-            prob_up = probabilities[1] if len(probabilities) > 1 else probabilities[0]
-            prob_down = probabilities[0]
+            # Predict: standardize, dot with the coefficients and apply the sigmoid, which is
+            # what scaler.transform + predict_proba compute for a binary model
+            z = ((X_latest - self._mu) / self._sd) @ self._w + self._b
+            prob_up = 1.0 / (1.0 + np.exp(-z))
+            prob_down = 1.0 - prob_up
             
-            direction = "UP" if prediction == 1 else "DOWN"
+            direction = "UP" if z > 0 else "DOWN"
             
             return direction, prob_up, prob_down, None
             
@@ -189,6 +299,42 @@ class StockPricePredictor:
         return feature_importance
 
 
+def _single_option_features(option_row, current_price, dte):
+    """
+    Scalar counterpart of prepare_features_from_option_data for one dict-like option row.
+    Returns a 1 x 10 feature matrix.
+    """
+    strike = option_row.get('strike', 0)
+    premium = option_row.get('lastPrice', 0)
+    iv = option_row.get('impliedVolatility', 0)
+    volume = option_row.get('volume', 0)
+    oi = option_row.get('openInterest', 0)
+    delta = option_row.get('delta', 0)
+    bid = option_row.get('bid', 0)
+    ask = option_row.get('ask', 0)
+    
+    moneyness = current_price / strike if strike > 0 else 1.0
+    distance_pct = abs(current_price - strike) / current_price * 100
+    spread = ask - bid if ask > 0 and bid > 0 else 0
+    spread_pct = (spread / premium * 100) if premium > 0 else 0
+    liquidity_score = (volume * 0.5 + oi * 0.5) / 1000  # Normalized
+    
+    intrinsic = max(0, current_price - strike) if option_row.get('option_type') == 'call' else max(0, strike - current_price)
+    time_value = max(0, premium - intrinsic)
+    time_value_pct = (time_value / premium * 100) if premium > 0 else 0
+    
+    pop = calculations.calculate_pop(
+        option_row.get('option_type', 'call'),
+        strike, premium, current_price, iv, dte
+    )
+    pop = pop if not np.isnan(pop) else 0.5
+    
+    return np.array([[
+        moneyness, distance_pct, iv, delta, spread_pct, liquidity_score,
+        time_value_pct, pop, dte / 365.0, premium / current_price
+    ]], dtype=np.float64)
+
+
 class OptionProfitabilityPredictor:
     """
     Logistic Regression model to predict if an option will be profitable.
@@ -204,73 +350,70 @@ class OptionProfitabilityPredictor:
         """
         Prepare features from options chain data.
         """
-        if options_df.empty:
+        n = len(options_df)
+        if n == 0:
             return None, None
         
-        # Calculate features for each option
-        features_list = []
-        targets = []
+        def column(name):
+            # Missing columns read as 0, like row.get(name, 0)
+            if name in options_df.columns:
+                return options_df[name].to_numpy(dtype=np.float64)
+            return np.zeros(n)
         
-        for idx, row in options_df.iterrows():
-            # Option features
-            strike = row.get('strike', 0)
-            premium = row.get('lastPrice', 0)
-            iv = row.get('impliedVolatility', 0)
-            volume = row.get('volume', 0)
-            oi = row.get('openInterest', 0)
-            delta = row.get('delta', 0)
-            bid = row.get('bid', 0)
-            ask = row.get('ask', 0)
-            
+        # Option features, one array per column
+        strike = column('strike')
+        premium = column('lastPrice')
+        iv = column('impliedVolatility')
+        volume = column('volume')
+        oi = column('openInterest')
+        delta = column('delta')
+        bid = column('bid')
+        ask = column('ask')
+        option_type = options_df['option_type'].to_numpy() if 'option_type' in options_df.columns else None
+        
+        with np.errstate(divide='ignore', invalid='ignore'):
             # Moneyness
-            moneyness = current_price / strike if strike > 0 else 1.0
+            moneyness = np.where(strike > 0, current_price / strike, 1.0)
             
             # Distance from ATM
-            distance_pct = abs(current_price - strike) / current_price * 100
+            distance_pct = np.abs(current_price - strike) / current_price * 100
             
             # Spread
-            spread = ask - bid if ask > 0 and bid > 0 else 0
-            spread_pct = (spread / premium * 100) if premium > 0 else 0
+            spread = np.where((ask > 0) & (bid > 0), ask - bid, 0.0)
+            spread_pct = np.where(premium > 0, spread / premium * 100, 0.0)
             
             # Liquidity score
             liquidity_score = (volume * 0.5 + oi * 0.5) / 1000  # Normalized
             
-            # Time value
-            intrinsic = max(0, current_price - strike) if row.get('option_type') == 'call' else max(0, strike - current_price)
-            time_value = max(0, premium - intrinsic)
-            time_value_pct = (time_value / premium * 100) if premium > 0 else 0
-            
-            # POP (Probability of Profit)
-            pop = calculations.calculate_pop(
-                row.get('option_type', 'call'),
-                strike, premium, current_price, iv, dte
-            )
-            pop = pop if not np.isnan(pop) else 0.5
-            
-            features = [
-                moneyness,
-                distance_pct,
-                iv,
-                delta,
-                spread_pct,
-                liquidity_score,
-                time_value_pct,
-                pop,
-                dte / 365.0,  # Time to expiration in years
-                premium / current_price  # Premium as % of stock price
-            ]
-            
-            features_list.append(features)
-            
-            # Target: Would this option be profitable? (simplified - would need historical data)
-            # For now, we'll use POP > 0.5 as proxy
-            targets.append(1 if pop > 0.5 else 0)
+            # Time value (rows without an option_type are valued as puts; fmax treats NaN like max(0, nan))
+            is_call = option_type == 'call' if option_type is not None else np.zeros(n, dtype=bool)
+            intrinsic = np.fmax(0.0, np.where(is_call, current_price - strike, strike - current_price))
+            time_value = np.fmax(0.0, premium - intrinsic)
+            time_value_pct = np.where(premium > 0, time_value / premium * 100, 0.0)
         
-        if not features_list:
-            return None, None
+        # POP (Probability of Profit) for the whole chain in one call; rows default to calls
+        pop = calculations.calculate_pop_vec(
+            option_type if option_type is not None else 'call',
+            strike, premium, current_price, iv, dte
+        )
+        pop = np.where(np.isnan(pop), 0.5, pop)
         
-        X = np.array(features_list)
-        y = np.array(targets)
+        # Fill the feature matrix column by column instead of stacking intermediate arrays
+        X = np.empty((n, 10), dtype=np.float64)
+        X[:, 0] = moneyness
+        X[:, 1] = distance_pct
+        X[:, 2] = iv
+        X[:, 3] = delta
+        X[:, 4] = spread_pct
+        X[:, 5] = liquidity_score
+        X[:, 6] = time_value_pct
+        X[:, 7] = pop
+        X[:, 8] = dte / 365.0  # Time to expiration in years
+        X[:, 9] = premium / current_price  # Premium as % of stock price
+        
+        # Target: Would this option be profitable? (simplified - would need historical data)
+        # For now, we'll use POP > 0.5 as proxy
+        y = (pop > 0.5).astype(np.int8)
         
         return X, y
     
@@ -282,12 +425,8 @@ class OptionProfitabilityPredictor:
             return None, None, None
         
         try:
-            # Convert single row to DataFrame for feature preparation
-            options_df = pd.DataFrame([option_row])
-            X, _ = self.prepare_features_from_option_data(options_df, current_price, dte)
-            
-            if X is None or len(X) == 0:
-                return None, None, None
+            # Single record goes straight to a feature row, no DataFrame round-trip
+            X = _single_option_features(option_row, current_price, dte)
             
             X_scaled = self.scaler.transform(X)
             prediction = self.model.predict(X_scaled)[0]
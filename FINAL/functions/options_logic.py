@@ -6,17 +6,13 @@ import yfinance as yf
 from functions import calculations
 
 def calculate_option_pnl(option_type, strike_price, premium, underlying_prices):
-    """Calculates Profit/Loss for a single option leg at expiration."""
-    pnl = []
+    """Calculates Profit/Loss for a single option leg at expiration, as an array over underlying_prices."""
+    prices = np.asarray(underlying_prices, dtype=np.float64)
     if option_type == 'call':
-        for price in underlying_prices:
-            profit_loss = max(0, price - strike_price) - premium 
-            pnl.append(profit_loss)
+        return np.maximum(0.0, prices - strike_price) - premium
     elif option_type == 'put':
-        for price in underlying_prices:
-            profit_loss = max(0, strike_price - price) - premium 
-            pnl.append(profit_loss)
-    return pnl
+        return np.maximum(0.0, strike_price - prices) - premium
+    return np.empty(0)
 
 def calculate_breakeven(option_type, strike_price, premium):
     """Calculate breakeven price for option."""
@@ -38,364 +34,432 @@ def calculate_time_value(last_price, intrinsic_value):
     """Calculate time value (extrinsic value) of option."""
     return max(0, last_price - intrinsic_value)
 
+def _score_kernel(pop, volume, oi, spread_pct, delta, time_value, last_price, breakeven_distance_pct, is_call):
+    """Scoring half of rank_options_logic: fused array math over the filtered chain, one entry per output column."""
+    # 2. Liquidity Score (25%) - Critical for execution
+    volume_range = volume.max() - volume.min()
+    oi_range = oi.max() - oi.min()
+    norm_volume = (volume - volume.min()) / (volume_range + 1e-9) if volume_range != 0 else np.full(len(volume), 0.5)
+    norm_oi = (oi - oi.min()) / (oi_range + 1e-9) if oi_range != 0 else np.full(len(oi), 0.5)
+    
+    # Spread score (tighter spread = better)
+    spread_score = np.clip(1 - (spread_pct / 20), 0, 1)  # Normalized to 0-1
+    
+    liquidity_score = (
+        norm_volume * 0.4 + 
+        norm_oi * 0.4 + 
+        spread_score * 0.2
+    )
+    
+    # 3. Value Score (20%) - Risk/reward consideration
+    # Prefer options with good time value relative to price (not overpaying)
+    time_value_ratio = np.clip(time_value / (last_price + 1e-9), 0, 1)
+    
+    # Breakeven achievability score (closer breakeven = higher score for reasonable moves)
+    # Ideal breakeven is 3-8% away for calls, 3-8% for puts
+    ideal_breakeven_distance = 5.0  # 5% is ideal
+    breakeven_score = np.clip(1 - np.abs(breakeven_distance_pct - ideal_breakeven_distance) / 10, 0, 1)
+    
+    value_score = (
+        time_value_ratio * 0.4 +
+        breakeven_score * 0.6
+    )
+    
+    # 4. Delta Score (15%) - Probability proxy
+    # Prefer delta 0.3-0.7 (balance of leverage and probability); puts use absolute delta
+    delta_vals = delta if is_call else np.abs(delta)
+    delta_score = np.where(
+        (delta_vals >= 0.2) & (delta_vals <= 0.8), 1 - np.abs(delta_vals - 0.5) / 0.5, 0.2
+    )
+    
+    # Final weighted score
+    overall_score = (
+        pop * 0.40 +          
+        liquidity_score * 0.25 +    
+        value_score * 0.20 +        
+        delta_score * 0.15           
+    )
+    
+    return {
+        'norm_volume': norm_volume,
+        'norm_oi': norm_oi,
+        'spread_score': spread_score,
+        'liquidity_score': liquidity_score,
+        'time_value_ratio': time_value_ratio,
+        'breakeven_score': breakeven_score,
+        'value_score': value_score,
+        'delta_score': delta_score,
+        'Overall_Score': overall_score,
+    }
+
 def rank_options_logic(df_original, option_type, current_price_for_rank, dte_for_rank):
     """
     Enhanced ranking system with stricter quality filters and better scoring.
     """
-    df = df_original.copy()
-    
-    # Ensure delta exists
-    if 'delta' not in df.columns:
-        df['delta'] = np.nan 
-
     # CRITICAL FILTERS - Remove obviously bad options
+    # Boolean filtering yields new frames, so the caller's frame is never copied or modified
     required_cols = ["strike", "lastPrice", "bid", "ask", "volume", "openInterest", "impliedVolatility"]
-    df.dropna(subset=required_cols, inplace=True)
+    df = df_original.dropna(subset=required_cols)
     
     if df.empty:  
         return pd.DataFrame()  
 
-    # Filter 1: Valid prices (avoid division by zero and nonsense data)
-    df = df[(df['lastPrice'] > 0.01) & (df['bid'] > 0) & (df['ask'] > 0)]
-    
-    # Filter 2: Reasonable IV (remove extreme outliers)
-    df = df[(df['impliedVolatility'] > 0) & (df['impliedVolatility'] < 5.0)]
-    
-    # Filter 3: Minimum liquidity threshold (adjustable based on stock)
     min_volume = 10  # Minimum daily volume
     min_oi = 50  # Minimum open interest
-    df = df[(df['volume'] >= min_volume) & (df['openInterest'] >= min_oi)]
+    df = df[
+        # Filter 1: Valid prices (avoid division by zero and nonsense data)
+        (df['lastPrice'] > 0.01) & (df['bid'] > 0) & (df['ask'] > 0) &
+        # Filter 2: Reasonable IV (remove extreme outliers)
+        (df['impliedVolatility'] > 0) & (df['impliedVolatility'] < 5.0) &
+        # Filter 3: Minimum liquidity threshold (adjustable based on stock)
+        (df['volume'] >= min_volume) & (df['openInterest'] >= min_oi)
+    ]
     
     # Filter 4: Reasonable bid-ask spread (max 20% of mid-price)
-    df['mid_price'] = (df['bid'] + df['ask']) / 2
-    df['spread_pct'] = ((df['ask'] - df['bid']) / (df['mid_price'] + 1e-9)) * 100
-    df = df[df['spread_pct'] <= 20]
+    bid = df['bid'].to_numpy()
+    ask = df['ask'].to_numpy()
+    mid_price = (bid + ask) / 2
+    spread_pct = ((ask - bid) / (mid_price + 1e-9)) * 100
+    keep = spread_pct <= 20
+    df = df[keep]
     
     if df.empty:
         return pd.DataFrame()
 
-    # Calculate POP with enhanced error handling
-    df.loc[:, 'POP'] = df.apply(
-        lambda row: calculations.calculate_pop(
-            option_type, 
-            row['strike'], 
-            row['lastPrice'], 
-            current_price_for_rank, 
-            row['impliedVolatility'], 
-            dte_for_rank
-        ), 
-        axis=1
-    )
-    df['POP'].fillna(0, inplace=True)
+    # Every derived column is collected here and attached with a single assign() at the end
+    cols = {}
     
-    # Calculate additional metrics
-    df.loc[:, 'intrinsic_value'] = df.apply(
-        lambda row: calculate_intrinsic_value(option_type, row['strike'], current_price_for_rank),
-        axis=1
-    )
-    df.loc[:, 'time_value'] = df.apply(
-        lambda row: calculate_time_value(row['lastPrice'], row['intrinsic_value']),
-        axis=1
-    )
-    df.loc[:, 'breakeven'] = df.apply(
-        lambda row: calculate_breakeven(option_type, row['strike'], row['lastPrice']),
-        axis=1
-    )
+    # Ensure delta exists; missing deltas score as 0.5
+    if 'delta' in df.columns:
+        delta = df['delta'].to_numpy(dtype=np.float64)
+        delta = np.where(np.isnan(delta), 0.5, delta)
+    else:
+        delta = np.full(len(df), 0.5)
+    cols['delta'] = delta
+    cols['mid_price'] = mid_price[keep]
+    cols['spread_pct'] = spread_pct = spread_pct[keep]
+
+    # Calculate POP for the whole filtered chain in one vectorized call (invalid rows count as 0)
+    cols['POP'] = pop = np.nan_to_num(calculations.calculate_pop_vec(
+        option_type, 
+        df['strike'].to_numpy(), 
+        df['lastPrice'].to_numpy(), 
+        current_price_for_rank, 
+        df['impliedVolatility'].to_numpy(), 
+        dte_for_rank
+    ), nan=0.0)
+    
+    # Calculate additional metrics (array forms of calculate_intrinsic_value/time_value/breakeven)
+    strike = df['strike'].to_numpy()
+    last_price = df['lastPrice'].to_numpy()
+    if option_type == 'call':
+        intrinsic_value = np.maximum(0, current_price_for_rank - strike)
+        breakeven = strike + last_price
+    elif option_type == 'put':
+        intrinsic_value = np.maximum(0, strike - current_price_for_rank)
+        breakeven = strike - last_price
+    else:
+        intrinsic_value = np.zeros(len(df))
+        breakeven = np.full(len(df), np.nan)
+    time_value = np.maximum(0, last_price - intrinsic_value)
+    cols['intrinsic_value'] = intrinsic_value
+    cols['time_value'] = time_value
+    cols['breakeven'] = breakeven
     
     # Distance to breakeven as percentage
-    df.loc[:, 'breakeven_distance_pct'] = abs(
-        (df['breakeven'] - current_price_for_rank) / (current_price_for_rank + 1e-9) * 100
+    cols['breakeven_distance_pct'] = breakeven_distance_pct = np.abs(
+        (breakeven - current_price_for_rank) / (current_price_for_rank + 1e-9) * 100
     )
     
     # --- ENHANCED SCORING SYSTEM ---
     
     # 1. POP Score (40%) - Higher weight for probability
-    df.loc[:, 'pop_score'] = df['POP']
+    cols['pop_score'] = pop
     
-    # 2. Liquidity Score (25%) - Critical for execution
-    max_volume = df['volume'].max()
-    min_volume_val = df['volume'].min()
-    max_oi = df['openInterest'].max()
-    min_oi_val = df['openInterest'].min()
-    
-    df.loc[:, 'norm_volume'] = (df['volume'] - min_volume_val) / (max_volume - min_volume_val + 1e-9) if (max_volume - min_volume_val) != 0 else 0.5
-    df.loc[:, 'norm_oi'] = (df['openInterest'] - min_oi_val) / (max_oi - min_oi_val + 1e-9) if (max_oi - min_oi_val) != 0 else 0.5
-    
-    # Spread score (tighter spread = better)
-    df.loc[:, 'spread_score'] = 1 - (df['spread_pct'] / 20)  # Normalized to 0-1
-    df['spread_score'] = df['spread_score'].clip(0, 1)
+    # 2-4. Liquidity, value and delta scores plus the weighted total
+    volume = df['volume'].to_numpy()
+    oi = df['openInterest'].to_numpy()
+    cols.update(_score_kernel(
+        pop, volume, oi, spread_pct, delta, time_value, last_price,
+        breakeven_distance_pct, option_type == 'call'
+    ))
+    overall_score = cols['Overall_Score']
     
-    df.loc[:, 'liquidity_score'] = (
-        df['norm_volume'] * 0.4 + 
-        df['norm_oi'] * 0.4 + 
-        df['spread_score'] * 0.2
+    # Add quality tier classification
+    # Right-closed buckets (0, 0.4], (0.4, 0.6], (0.6, 0.75], (0.75, 1.0]; delta_score's 0.2 floor keeps scores above 0.
+    # searchsorted sorts NaN past the last edge, so NaN scores (e.g. no breakeven) are masked back to NaN like pd.cut
+    tier_labels = np.array(['Poor', 'Fair', 'Good', 'Excellent'], dtype=object)
+    cols['Quality_Tier'] = np.where(
+        np.isnan(overall_score), np.nan, tier_labels[np.searchsorted([0.4, 0.6, 0.75], overall_score)]
     )
-    
-    # 3. Value Score (20%) - Risk/reward consideration
-    # Prefer options with good time value relative to price (not overpaying)
-    df.loc[:, 'time_value_ratio'] = df['time_value'] / (df['lastPrice'] + 1e-9)
-    df.loc[:, 'time_value_ratio'] = df['time_value_ratio'].clip(0, 1)
-    
-    # Breakeven achievability score (closer breakeven = higher score for reasonable moves)
-    # Ideal breakeven is 3-8% away for calls, 3-8% for puts
-    ideal_breakeven_distance = 5.0  # 5% is ideal
-    df.loc[:, 'breakeven_score'] = 1 - abs(df['breakeven_distance_pct'] - ideal_breakeven_distance) / 10
-    df['breakeven_score'] = df['breakeven_score'].clip(0, 1)
-    
-    df.loc[:, 'value_score'] = (
-        df['time_value_ratio'] * 0.4 +
-        df['breakeven_score'] * 0.6
+
+    return df.assign(**cols).sort_values("Overall_Score", ascending=False)
+
+# Scoring tables for analyze_single_option_details: (edges, searchsorted side, points, (is_red_flag, template)).
+# np.searchsorted(edges, value, side) picks the tier; 'right' makes an edge the lower bound (>=), 'left' the upper (<=).
+# Probability of Profit (25 points): >= 0.35 / 0.45 / 0.55
+_POP_TIERS = (
+    np.array([0.35, 0.45, 0.55]), 'right', np.array([5, 15, 20, 25]),
+    (
+        (True, "ðŸš© **Low POP: {:.1f}%** - Poor probability of profit"),
+        (False, "â„¹ï¸ **Fair POP: {:.1f}%** - Below average probability"),
+        (False, "ðŸ‘ **Moderate POP: {:.1f}%** - Reasonable probability"),
+        (False, "âœ… **High POP: {:.1f}%** - Strong probability of profit"),
+    ),
+)
+
+# Volume (10 of the 25 liquidity points): >= 50 / 100 / 500
+_VOLUME_TIERS = (
+    np.array([50, 100, 500]), 'right', np.array([0, 4, 7, 10]),
+    (
+        (True, "ðŸš© **Low Volume: {:,.0f}** - May have execution issues"),
+        (False, "â„¹ï¸ **Moderate Volume: {:,.0f}** - Acceptable but watch slippage"),
+        (False, "ðŸ‘ **Good Volume: {:,.0f}** - Adequate liquidity"),
+        (False, "âœ… **Excellent Volume: {:,.0f}** - Very liquid"),
+    ),
+)
+
+# Open interest (10 liquidity points): >= 100 / 500 / 1000
+_OI_TIERS = (
+    np.array([100, 500, 1000]), 'right', np.array([0, 4, 7, 10]),
+    (
+        (True, "ðŸš© **Low Open Interest: {:,.0f}** - Very illiquid"),
+        (False, "â„¹ï¸ **Moderate Open Interest: {:,.0f}** - Limited market depth"),
+        (False, "ðŸ‘ **Good Open Interest: {:,.0f}** - Decent market depth"),
+        (False, "âœ… **High Open Interest: {:,.0f}** - Strong market interest"),
+    ),
+)
+
+# Spread % (5 liquidity points): <= 5 / 10 / 15
+_SPREAD_TIERS = (
+    np.array([5, 10, 15]), 'left', np.array([5, 3, 1, 0]),
+    (
+        (False, "âœ… **Tight Spread: {:.1f}%** - Low transaction cost"),
+        (False, "ðŸ‘ **Acceptable Spread: {:.1f}%** - Reasonable cost"),
+        (False, "â„¹ï¸ **Wide Spread: {:.1f}%** - High transaction cost"),
+        (True, "ðŸš© **Very Wide Spread: {:.1f}%** - Expensive to trade"),
+    ),
+)
+
+# Implied volatility (15 points): < 0.15 / 0.15-0.60 / up to 1.0 / above; NaN lands in the last tier
+_IV_TIERS = (
+    np.array([0.15, np.nextafter(0.60, np.inf), np.nextafter(1.0, np.inf)]), 'right', np.array([8, 15, 10, 5]),
+    (
+        (True, "ðŸš© **Very Low IV: {:.1%}** - Cheap but limited movement expected"),
+        (False, "âœ… **Healthy IV: {:.1%}** - Fairly priced premium"),
+        (False, "â„¹ï¸ **Elevated IV: {:.1%}** - Premium is expensive but big moves expected"),
+        (True, "ðŸš© **Extreme IV: {:.1%}** - Very expensive premium"),
+    ),
+)
+
+# Call delta (20 points): 0.15 / 0.25 / 0.40 / 0.60-0.80; anything outside 0.15-0.80 is a red flag
+_CALL_DELTA_TIERS = (
+    np.array([0.15, 0.25, 0.40, 0.60, np.nextafter(0.80, np.inf)]), 'right', np.array([3, 8, 14, 18, 20, 3]),
+    (
+        (True, "ðŸš© **Very Low Delta: {:.2f}** - Far OTM, lottery ticket"),
+        (False, "â„¹ï¸ **Low Delta: {:.2f}** - OTM, needs significant move"),
+        (False, "ðŸ‘ **Moderate Delta: {:.2f}** - Decent leverage, lower probability"),
+        (False, "âœ… **Balanced Delta: {:.2f}** - ATM sweet spot"),
+        (False, "âœ… **Strong Delta: {:.2f}** - High probability ITM, good leverage"),
+        (True, "ðŸš© **Very Low Delta: {:.2f}** - Far OTM, lottery ticket"),
+    ),
+)
+
+# Put delta, looked up by absolute value
+_PUT_DELTA_TIERS = (
+    np.array([0.15, 0.25, 0.40, 0.60, np.nextafter(0.80, np.inf)]), 'right', np.array([3, 8, 14, 18, 20, 3]),
+    (
+        (True, "ðŸš© **Very Low Delta: {:.2f}** - Far OTM"),
+        (False, "â„¹ï¸ **Low Delta: {:.2f}** - OTM, needs significant move"),
+        (False, "ðŸ‘ **Moderate Delta: {:.2f}** - Decent leverage"),
+        (False, "âœ… **Balanced Delta: {:.2f}** - ATM sweet spot"),
+        (False, "âœ… **Strong Delta: {:.2f}** - High probability ITM"),
+        (True, "ðŸš© **Very Low Delta: {:.2f}** - Far OTM"),
+    ),
+)
+
+# Breakeven distance % (8 of the 15 value points): <= 3 / 6 / 10
+_BREAKEVEN_TIERS = (
+    np.array([3, 6, 10]), 'left', np.array([8, 6, 3, 0]),
+    (
+        (False, "âœ… **Close Breakeven: {:.1f}%** - Needs only small move"),
+        (False, "ðŸ‘ **Reasonable Breakeven: {:.1f}%** - Moderate move needed"),
+        (False, "â„¹ï¸ **Distant Breakeven: {:.1f}%** - Significant move needed"),
+        (True, "ðŸš© **Very Distant Breakeven: {:.1f}%** - Large move required"),
+    ),
+)
+
+# Time value % of premium (7 value points): < 30 / 30-70 / above
+_TIME_VALUE_TIERS = (
+    np.array([30, np.nextafter(70, np.inf)]), 'right', np.array([4, 7, 2]),
+    (
+        (False, "â„¹ï¸ **Low Time Value: {:.0f}%** - Mostly intrinsic"),
+        (False, "âœ… **Balanced Time Value: {:.0f}%** - Fair pricing"),
+        (True, "ðŸš© **High Time Value: {:.0f}%** - Paying mostly for time"),
+    ),
+)
+
+def _tier_message(tiers, value, shown):
+    """(is_red_flag, text) for value's tier, formatted with shown."""
+    edges, side, points, messages = tiers
+    is_red_flag, template = messages[int(np.searchsorted(edges, value, side=side))]
+    return is_red_flag, template.format(shown)
+
+def _grade_vec(tiers, values):
+    """Tier lookup over an array: (points, is_red_flag) per value."""
+    edges, side, points, messages = tiers
+    i = np.searchsorted(edges, values, side=side)
+    return points[i], np.array([is_red_flag for is_red_flag, _ in messages])[i]
+
+# (recommendation, confidence) from best to worst; _recommendation_tier picks the row
+_RECOMMENDATIONS = (
+    ("ðŸš€ STRONG BUY", "High Confidence - Excellent setup across all metrics"),
+    ("âœ… BUY", "Good Confidence - Strong overall profile"),
+    ("ðŸ‘ CONSIDER", "Moderate Confidence - Decent setup but monitor closely"),
+    ("âš ï¸ CAUTION", "Low Confidence - Significant concerns present"),
+    ("ðŸ›‘ AVOID", "Not Recommended - Too many risk factors"),
+)
+
+def _recommendation_tier(score, n_red_flags):
+    """Index into _RECOMMENDATIONS for a score and red-flag count (scalars or arrays)."""
+    return np.select(
+        [
+            (score >= 80) & (n_red_flags == 0),
+            (score >= 70) & (n_red_flags <= 1),
+            score >= 60,
+            score >= 50,
+        ],
+        [0, 1, 2, 3],
+        default=4
     )
+
+def _score_options(df, current_price, dte, option_type):
+    """
+    The analyze_single_option_details scoring ladder over every row of df.
+    Returns a dict of arrays; 'graded' holds the (tiers, value, shown) triples after POP, in message order.
+    """
+    price = df['lastPrice'].to_numpy(dtype=np.float64)
+    iv = df['impliedVolatility'].to_numpy(dtype=np.float64)
+    volume = df['volume'].to_numpy(dtype=np.float64)
+    oi = df['openInterest'].to_numpy(dtype=np.float64)
+    strike = df['strike'].to_numpy(dtype=np.float64)
+    spread = df['ask'].to_numpy(dtype=np.float64) - df['bid'].to_numpy(dtype=np.float64)
+    if 'delta' in df.columns:
+        delta = np.nan_to_num(df['delta'].to_numpy(dtype=np.float64), nan=0.0)
+    else:
+        delta = np.zeros(len(df))
     
-    # 4. Delta Score (15%) - Probability proxy
-    df["delta"] = df["delta"].fillna(0.5)
-    
+    # Calculate all metrics
+    pop = calculations.calculate_pop_vec(option_type, strike, price, current_price, iv, dte)
     if option_type == 'call':
-        # For calls, prefer delta 0.3-0.7 (balance of leverage and probability)
-        df.loc[:, "delta_score"] = df["delta"].apply(
-            lambda x: 1 - abs(x - 0.5) / 0.5 if 0.2 <= x <= 0.8 else 0.2
-        )
+        intrinsic = np.maximum(0, current_price - strike)
+        breakeven = strike + price
     else:  # put
-        # For puts, prefer absolute delta 0.3-0.7
-        df.loc[:, "delta_score"] = df["delta"].apply(
-            lambda x: 1 - abs(abs(x) - 0.5) / 0.5 if 0.2 <= abs(x) <= 0.8 else 0.2
-        )
-    
-    # Final weighted score
-    df.loc[:, 'Overall_Score'] = (
-        df['pop_score'] * 0.40 +          
-        df['liquidity_score'] * 0.25 +    
-        df['value_score'] * 0.20 +        
-        df['delta_score'] * 0.15           
-    )
+        intrinsic = np.maximum(0, strike - current_price)
+        breakeven = strike - price
+    time_value = np.maximum(0, price - intrinsic)
+    breakeven_pct = np.abs(breakeven - current_price) / (current_price + 1e-9) * 100
+    with np.errstate(divide='ignore', invalid='ignore'):
+        spread_pct = np.where(price > 0, spread / (price + 1e-9) * 100, 0)
+        time_value_pct = np.where(price > 0, time_value / (price + 1e-9) * 100, 0)
     
-    # Add quality tier classification
-    df.loc[:, 'Quality_Tier'] = pd.cut(
-        df['Overall_Score'],
-        bins=[0, 0.4, 0.6, 0.75, 1.0],
-        labels=['Poor', 'Fair', 'Good', 'Excellent']
-    )
-
-    return df.sort_values("Overall_Score", ascending=False)
+    # --- SCORING SYSTEM (0-100) ---
+    # 1. Probability of Profit (25 points); zero/NaN POP scores 0 with an N/A note
+    pop_valid = ~(np.isnan(pop) | (pop == 0))
+    pop_points, pop_flag = _grade_vec(_POP_TIERS, pop)
+    graded = [
+        # 2. Liquidity (25 points): volume, open interest and spread; missing volume/OI count as the lowest tier
+        (_VOLUME_TIERS, np.where(np.isnan(volume), -np.inf, volume), volume),
+        (_OI_TIERS, np.where(np.isnan(oi), -np.inf, oi), oi),
+        (_SPREAD_TIERS, spread_pct, spread_pct),
+        # 3. Implied Volatility (15 points)
+        (_IV_TIERS, iv, iv),
+        # 4. Moneyness/Delta (20 points); puts are graded on absolute delta
+        (_CALL_DELTA_TIERS, delta, delta) if option_type == 'call' else (_PUT_DELTA_TIERS, np.abs(delta), delta),
+        # 5. Time Value & Breakeven (15 points)
+        (_BREAKEVEN_TIERS, breakeven_pct, breakeven_pct),
+        (_TIME_VALUE_TIERS, time_value_pct, time_value_pct),
+    ]
+    score = np.where(pop_valid, pop_points, 0)
+    red_flag_count = (pop_valid & pop_flag).astype(int)
+    for tiers, value, _ in graded:
+        points, flags = _grade_vec(tiers, value)
+        score = score + points
+        red_flag_count = red_flag_count + flags
+    
+    # Risk/Reward: target 100% gain, stop at 50% loss
+    stop_loss = price * 0.5
+    with np.errstate(divide='ignore', invalid='ignore'):
+        rr_ratio = np.where(stop_loss > 0, price / (stop_loss + 1e-9), np.nan)
+    
+    return {
+        'price': price,
+        'pop': pop,
+        'pop_valid': pop_valid,
+        'breakeven': breakeven,
+        'breakeven_pct': breakeven_pct,
+        'graded': graded,
+        'score': score,
+        'red_flag_count': red_flag_count,
+        'tier': _recommendation_tier(score, red_flag_count),
+        'rr_ratio': rr_ratio,
+    }
 
 def analyze_single_option_details(row, current_price, dte, option_type):
     """
     ENHANCED comprehensive analysis with clear buy/no-buy recommendation.
+    Scores come from the same _score_options pass as analyze_options_batch; only the reasons text is built here.
     """
-    price = row["lastPrice"]
-    iv = row["impliedVolatility"]
-    volume, oi = row["volume"], row["openInterest"]
-    delta = row.get("delta", 0.0) if pd.notnull(row.get("delta", 0.0)) else 0.0
-    strike = row['strike']
-    bid = row['bid']
-    ask = row['ask']
-    
-    # Calculate all metrics
-    pop = calculations.calculate_pop(option_type, strike, price, current_price, iv, dte)
-    intrinsic = calculate_intrinsic_value(option_type, strike, current_price)
-    time_value = calculate_time_value(price, intrinsic)
-    breakeven = calculate_breakeven(option_type, strike, price)
-    
-    # Distance to breakeven
-    breakeven_distance = abs(breakeven - current_price)
-    breakeven_pct = (breakeven_distance / (current_price + 1e-9)) * 100
-    
-    # Spread analysis
-    spread = ask - bid
-    spread_pct = (spread / (price + 1e-9)) * 100 if price > 0 else 0
-    
-    # Risk metrics
-    max_loss = price  # For long options
+    scored = _score_options(pd.DataFrame([row]), current_price, dte, option_type)
     
-    # --- SCORING SYSTEM (0-100) ---
-    score = 0
-    max_score = 100
     reasons = []
     red_flags = []
-    
-    # 1. Probability of Profit (25 points)
-    if pd.isna(pop) or pop == 0:
-        reasons.append("âš ï¸ **POP N/A** - Cannot calculate probability (check IV/DTE)")
-        pop_score = 0
-    elif pop >= 0.55:
-        pop_score = 25
-        reasons.append(f"âœ… **High POP: {pop*100:.1f}%** - Strong probability of profit")
-    elif pop >= 0.45:
-        pop_score = 20
-        reasons.append(f"ðŸ‘ **Moderate POP: {pop*100:.1f}%** - Reasonable probability")
-    elif pop >= 0.35:
-        pop_score = 15
-        reasons.append(f"â„¹ï¸ **Fair POP: {pop*100:.1f}%** - Below average probability")
-    else:
-        pop_score = 5
-        red_flags.append(f"ðŸš© **Low POP: {pop*100:.1f}%** - Poor probability of profit")
-    
-    score += pop_score
-    
-    # 2. Liquidity (25 points)
-    liquidity_score = 0
-    
-    # Volume check
-    if volume >= 500:
-        liquidity_score += 10
-        reasons.append(f"âœ… **Excellent Volume: {volume:,.0f}** - Very liquid")
-    elif volume >= 100:
-        liquidity_score += 7
-        reasons.append(f"ðŸ‘ **Good Volume: {volume:,.0f}** - Adequate liquidity")
-    elif volume >= 50:
-        liquidity_score += 4
-        reasons.append(f"â„¹ï¸ **Moderate Volume: {volume:,.0f}** - Acceptable but watch slippage")
-    else:
-        red_flags.append(f"ðŸš© **Low Volume: {volume:,.0f}** - May have execution issues")
-    
-    # Open Interest check
-    if oi >= 1000:
-        liquidity_score += 10
-        reasons.append(f"âœ… **High Open Interest: {oi:,.0f}** - Strong market interest")
-    elif oi >= 500:
-        liquidity_score += 7
-        reasons.append(f"ðŸ‘ **Good Open Interest: {oi:,.0f}** - Decent market depth")
-    elif oi >= 100:
-        liquidity_score += 4
-        reasons.append(f"â„¹ï¸ **Moderate Open Interest: {oi:,.0f}** - Limited market depth")
-    else:
-        red_flags.append(f"ðŸš© **Low Open Interest: {oi:,.0f}** - Very illiquid")
-    
-    # Spread check
-    if spread_pct <= 5:
-        liquidity_score += 5
-        reasons.append(f"âœ… **Tight Spread: {spread_pct:.1f}%** - Low transaction cost")
-    elif spread_pct <= 10:
-        liquidity_score += 3
-        reasons.append(f"ðŸ‘ **Acceptable Spread: {spread_pct:.1f}%** - Reasonable cost")
-    elif spread_pct <= 15:
-        liquidity_score += 1
-        reasons.append(f"â„¹ï¸ **Wide Spread: {spread_pct:.1f}%** - High transaction cost")
-    else:
-        red_flags.append(f"ðŸš© **Very Wide Spread: {spread_pct:.1f}%** - Expensive to trade")
-    
-    score += liquidity_score
-    
-    # 3. Implied Volatility (15 points)
-    iv_score = 0
-    if 0.15 <= iv <= 0.60:
-        iv_score = 15
-        reasons.append(f"âœ… **Healthy IV: {iv:.1%}** - Fairly priced premium")
-    elif 0.60 < iv <= 1.0:
-        iv_score = 10
-        reasons.append(f"â„¹ï¸ **Elevated IV: {iv:.1%}** - Premium is expensive but big moves expected")
-    elif iv < 0.15:
-        iv_score = 8
-        red_flags.append(f"ðŸš© **Very Low IV: {iv:.1%}** - Cheap but limited movement expected")
-    else:
-        iv_score = 5
-        red_flags.append(f"ðŸš© **Extreme IV: {iv:.1%}** - Very expensive premium")
-    
-    score += iv_score
-    
-    # 4. Moneyness/Delta (20 points)
-    delta_score = 0
-    if option_type == 'call':
-        if 0.60 <= delta <= 0.80:
-            delta_score = 20
-            reasons.append(f"âœ… **Strong Delta: {delta:.2f}** - High probability ITM, good leverage")
-        elif 0.40 <= delta < 0.60:
-            delta_score = 18
-            reasons.append(f"âœ… **Balanced Delta: {delta:.2f}** - ATM sweet spot")
-        elif 0.25 <= delta < 0.40:
-            delta_score = 14
-            reasons.append(f"ðŸ‘ **Moderate Delta: {delta:.2f}** - Decent leverage, lower probability")
-        elif 0.15 <= delta < 0.25:
-            delta_score = 8
-            reasons.append(f"â„¹ï¸ **Low Delta: {delta:.2f}** - OTM, needs significant move")
-        else:
-            delta_score = 3
-            red_flags.append(f"ðŸš© **Very Low Delta: {delta:.2f}** - Far OTM, lottery ticket")
-    else:  # put
-        abs_delta = abs(delta)
-        if 0.60 <= abs_delta <= 0.80:
-            delta_score = 20
-            reasons.append(f"âœ… **Strong Delta: {delta:.2f}** - High probability ITM")
-        elif 0.40 <= abs_delta < 0.60:
-            delta_score = 18
-            reasons.append(f"âœ… **Balanced Delta: {delta:.2f}** - ATM sweet spot")
-        elif 0.25 <= abs_delta < 0.40:
-            delta_score = 14
-            reasons.append(f"ðŸ‘ **Moderate Delta: {delta:.2f}** - Decent leverage")
-        elif 0.15 <= abs_delta < 0.25:
-            delta_score = 8
-            reasons.append(f"â„¹ï¸ **Low Delta: {delta:.2f}** - OTM, needs significant move")
-        else:
-            delta_score = 3
-            red_flags.append(f"ðŸš© **Very Low Delta: {delta:.2f}** - Far OTM")
-    
-    score += delta_score
-    
-    # 5. Time Value & Breakeven (15 points)
-    value_score = 0
-    time_value_pct = (time_value / (price + 1e-9)) * 100 if price > 0 else 0
-    
-    if breakeven_pct <= 3:
-        value_score += 8
-        reasons.append(f"âœ… **Close Breakeven: {breakeven_pct:.1f}%** - Needs only small move")
-    elif breakeven_pct <= 6:
-        value_score += 6
-        reasons.append(f"ðŸ‘ **Reasonable Breakeven: {breakeven_pct:.1f}%** - Moderate move needed")
-    elif breakeven_pct <= 10:
-        value_score += 3
-        reasons.append(f"â„¹ï¸ **Distant Breakeven: {breakeven_pct:.1f}%** - Significant move needed")
+    pop = scored['pop'][0]
+    if scored['pop_valid'][0]:
+        messages = [_tier_message(_POP_TIERS, pop, pop * 100)]
     else:
-        red_flags.append(f"ðŸš© **Very Distant Breakeven: {breakeven_pct:.1f}%** - Large move required")
-    
-    if 30 <= time_value_pct <= 70:
-        value_score += 7
-        reasons.append(f"âœ… **Balanced Time Value: {time_value_pct:.0f}%** - Fair pricing")
-    elif time_value_pct < 30:
-        value_score += 4
-        reasons.append(f"â„¹ï¸ **Low Time Value: {time_value_pct:.0f}%** - Mostly intrinsic")
-    else:
-        value_score += 2
-        red_flags.append(f"ðŸš© **High Time Value: {time_value_pct:.0f}%** - Paying mostly for time")
-    
-    score += value_score
+        messages = [(False, "âš ï¸ **POP N/A** - Cannot calculate probability (check IV/DTE)")]
+    messages += [_tier_message(tiers, value[0], shown[0]) for tiers, value, shown in scored['graded']]
+    for is_red_flag, text in messages:
+        (red_flags if is_red_flag else reasons).append(text)
     
     # --- FINAL RECOMMENDATION ---
-    recommendation = ""
-    confidence = ""
-    
-    if score >= 80 and len(red_flags) == 0:
-        recommendation = "ðŸš€ STRONG BUY"
-        confidence = "High Confidence - Excellent setup across all metrics"
-    elif score >= 70 and len(red_flags) <= 1:
-        recommendation = "âœ… BUY"
-        confidence = "Good Confidence - Strong overall profile"
-    elif score >= 60:
-        recommendation = "ðŸ‘ CONSIDER"
-        confidence = "Moderate Confidence - Decent setup but monitor closely"
-    elif score >= 50:
-        recommendation = "âš ï¸ CAUTION"
-        confidence = "Low Confidence - Significant concerns present"
-    else:
-        recommendation = "ðŸ›‘ AVOID"
-        confidence = "Not Recommended - Too many risk factors"
-    
-    # Risk/Reward calculation
-    # Estimate target as 2x premium (100% return) and stop as 50% loss
-    target_profit = price * 1.0  # 100% gain
-    stop_loss = price * 0.5  # 50% loss
-    rr_ratio = target_profit / (stop_loss + 1e-9) if stop_loss > 0 else np.nan
+    recommendation, confidence = _RECOMMENDATIONS[int(scored['tier'][0])]
     
+    price = scored['price'][0]
     return (
         recommendation, 
         confidence,
-        score,
-        max_score,
+        int(scored['score'][0]),
+        100,  # max_score
         reasons, 
         red_flags,
-        max_loss, 
-        target_profit, 
-        rr_ratio, 
+        price,  # max_loss for long options
+        price * 1.0,  # target_profit: 100% gain
+        scored['rr_ratio'][0], 
         pop,
-        breakeven,
-        breakeven_pct
-    )
\ No newline at end of file
+        scored['breakeven'][0],
+        scored['breakeven_pct'][0]
+    )
+
+def analyze_options_batch(df, current_price, dte, option_type):
+    """
+    analyze_single_option_details scoring for every row of df at once (e.g. the rank_options_logic output).
+    Returns a frame on df's index with score, red_flag_count, recommendation, confidence, pop, breakeven,
+    breakeven_pct, max_loss, target_profit and rr_ratio; reasons text is left to the single-row call.
+    """
+    scored = _score_options(df, current_price, dte, option_type)
+    recommendations = np.array([rec for rec, _ in _RECOMMENDATIONS], dtype=object)
+    confidences = np.array([conf for _, conf in _RECOMMENDATIONS], dtype=object)
+    return pd.DataFrame({
+        'score': scored['score'],
+        'red_flag_count': scored['red_flag_count'],
+        'recommendation': recommendations[scored['tier']],
+        'confidence': confidences[scored['tier']],
+        'pop': scored['pop'],
+        'breakeven': scored['breakeven'],
+        'breakeven_pct': scored['breakeven_pct'],
+        'max_loss': scored['price'],
+        'target_profit': scored['price'] * 1.0,
+        'rr_ratio': scored['rr_ratio'],
+    }, index=df.index)
\ No newline at end of file
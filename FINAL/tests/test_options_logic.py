@@ -0,0 +1,36 @@
+import numpy as np
+import pandas as pd
+
+from functions import options_logic
+
+
+def _chain(n=40, seed=0):
+    rng = np.random.default_rng(seed)
+    bid = rng.uniform(1.0, 5.0, n)
+    return pd.DataFrame({
+        "strike": rng.uniform(90, 110, n),
+        "lastPrice": bid + 0.05,
+        "bid": bid,
+        "ask": bid + 0.1,
+        "volume": rng.integers(10, 2000, n).astype(float),
+        "openInterest": rng.integers(50, 5000, n).astype(float),
+        "impliedVolatility": rng.uniform(0.1, 1.0, n),
+        "delta": rng.uniform(0.05, 0.95, n),
+    })
+
+
+def test_quality_tier_matches_pd_cut():
+    ranked = options_logic.rank_options_logic(_chain(), "call", 100.0, 30)
+    expected = pd.cut(
+        ranked["Overall_Score"], bins=[0, 0.4, 0.6, 0.75, 1.0], labels=["Poor", "Fair", "Good", "Excellent"]
+    ).astype(object)
+    assert not ranked.empty
+    assert (ranked["Quality_Tier"].astype(object) == expected).all()
+
+
+def test_quality_tier_is_nan_for_nan_score():
+    # Unknown option types have no breakeven, so Overall_Score is NaN and must not be labelled 'Excellent'
+    ranked = options_logic.rank_options_logic(_chain(), "straddle", 100.0, 30)
+    assert not ranked.empty
+    assert ranked["Overall_Score"].isna().all()
+    assert ranked["Quality_Tier"].isna().all()